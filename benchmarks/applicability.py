@@ -0,0 +1,118 @@
+"""
+Applicability index of a knowledgebase with many KOs.
+
+Builds a knowledgebase of KOs with random age intervals and categorical predicates and
+compares, per patient, checking the predicates of every KO with the index lookup, and
+calculate_for_all executing every KO with skipping the inapplicable ones.
+
+    python benchmarks/applicability.py --kos 500 --patients 2000
+"""
+
+import argparse
+import random
+
+from common import ko_metadata, make_package, timed
+
+from kgrid_sdk.applicability import normalize_predicates
+
+SOURCE = '''
+from kgrid_sdk import Ko_Execution
+from kgrid_sdk.knowledgebase import KnowledgeBase
+
+
+class Benchmark_KnowledgeBase(KnowledgeBase):
+    pass
+
+
+class Benchmark_KO(Ko_Execution):
+    def __init__(self):
+        super().__init__([self.score])
+
+    @staticmethod
+    def score(age, gender, smoker, systolic):
+        total = 0
+        for _ in range(200):
+            total += (age or 0) * 0.1 + (systolic or 0) * 0.01
+        return {"score": total}
+'''
+
+
+def applies(predicates, patient):
+    # Brute-force check of one KO, with the semantics of the index
+    for field, predicate in predicates.items():
+        value = patient.get(field)
+        if value is None:
+            continue
+        if "in" in predicate:
+            if value not in predicate["in"]:
+                return False
+        elif (predicate["min"] is not None and value < predicate["min"]) or (
+            predicate["max"] is not None and value > predicate["max"]
+        ):
+            return False
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--kos", type=int, default=500)
+    parser.add_argument("--patients", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    rng = random.Random(args.seed)
+
+    package = make_package("benchmark_applicability", SOURCE, ko_metadata("benchmark-applicability"))
+    knowledgebase = package.Benchmark_KnowledgeBase("benchmark")
+    for i in range(args.kos):
+        low = rng.randrange(0, 90)
+        predicates = normalize_predicates(
+            {
+                "age": (low, low + rng.randrange(2, 15)),
+                "gender": rng.choice([0, 1]),
+                "smoker": rng.choice([[True], [True, False]]),
+            }
+        )
+        name = f"ko-{i}"
+        ko_class = type(
+            f"Benchmark_KO_{i}",
+            (package.Benchmark_KO,),
+            {
+                "__module__": package.__name__,
+                "applicability": predicates,
+                "get_id": classmethod(lambda cls, metadata_file=None, name=name: name),
+            },
+        )
+        knowledgebase.add_knowledge_object(ko_class())
+
+    patients = [
+        {
+            "age": rng.randrange(18, 95),
+            "gender": rng.choice([0, 1]),
+            "smoker": rng.choice([True, False]),
+            "systolic": rng.randrange(90, 180),
+        }
+        for _ in range(args.patients)
+    ]
+    predicates = {name: ko.get_applicability() for name, ko in knowledgebase.knowledge_objects.items()}
+    index = knowledgebase.get_applicability_index()
+    for patient in patients[:50]:
+        assert index.candidates(patient) == {name for name, p in predicates.items() if applies(p, patient)}
+    applicable = sum(len(index.candidates(patient)) for patient in patients) / len(patients)
+
+    brute_force = timed(
+        lambda: [[name for name, p in predicates.items() if applies(p, patient)] for patient in patients], 3
+    )
+    indexed = timed(lambda: [knowledgebase.applicable_knowledge_objects(patient) for patient in patients], 3)
+    execute_all = timed(lambda: [knowledgebase.calculate_for_all(patient, False) for patient in patients])
+    skip = timed(lambda: [knowledgebase.calculate_for_all(patient) for patient in patients])
+
+    per_patient = 1e6 / len(patients)
+    print(f"{args.kos} KOs, {args.patients} patients, {applicable:.1f} applicable KOs per patient")
+    print(f"applicable KOs, brute force:       {brute_force * per_patient:10.1f} us/patient")
+    print(f"applicable KOs, index:             {indexed * per_patient:10.1f} us/patient")
+    print(f"calculate_for_all, every KO:       {execute_all * per_patient:10.1f} us/patient")
+    print(f"calculate_for_all, applicable KOs: {skip * per_patient:10.1f} us/patient")
+
+
+if __name__ == "__main__":
+    main()
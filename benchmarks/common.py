@@ -0,0 +1,48 @@
+import importlib
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+_directory = None
+
+
+def make_package(name: str, source: str, metadata: dict):
+    """
+    Writes a KO package (an __init__.py and its metadata.json) to a temporary folder on
+    sys.path and imports it. KOs look up their metadata next to the package of their class.
+    """
+    global _directory
+    if _directory is None:
+        _directory = tempfile.TemporaryDirectory(prefix="kgrid-benchmark-")
+        sys.path.insert(0, _directory.name)
+    package = Path(_directory.name) / name
+    package.mkdir()
+    (package / "__init__.py").write_text(source)
+    with open(package / "metadata.json", "w", encoding="utf-8") as f:
+        json.dump(metadata, f)
+    return importlib.import_module(name)
+
+
+def ko_metadata(id: str, **properties):
+    return {
+        "@context": "https://kgrid.org/koio/2.1/context",
+        "@id": id,
+        "@type": "KnowledgeObject",
+        "dc:title": id,
+        "dc:version": "v1.0",
+        "dc:description": f"Benchmark KO {id}",
+        **properties,
+    }
+
+
+def timed(function, repeat: int = 1):
+    # Best wall time of `repeat` runs, in seconds
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best
@@ -0,0 +1,85 @@
+"""
+Field plan of a knowledgebase over wide records.
+
+Builds a knowledgebase of KOs whose knowledge functions each read a few fields of
+records with many fields, and compares calculate_for_all, which projects the record
+through the precompiled field plan, with executing every KO on the full record as
+calculate_for_all did before the field plan.
+
+    python benchmarks/field_plan.py --kos 40 --parameters 6 --fields 500 --records 2000
+"""
+
+import argparse
+import random
+
+from common import ko_metadata, make_package, timed
+
+HEADER = '''
+from kgrid_sdk import Ko_Execution
+from kgrid_sdk.knowledgebase import KnowledgeBase
+
+
+class Benchmark_KnowledgeBase(KnowledgeBase):
+    pass
+'''
+
+KO_SOURCE = '''
+
+class Benchmark_KO_{i}(Ko_Execution):
+    def __init__(self):
+        super().__init__([self.score])
+
+    @classmethod
+    def get_id(cls, metadata_file=None):
+        return "ko-{i}"
+
+    @staticmethod
+    def score({parameters}):
+        return sum(value or 0 for value in ({parameters},))
+'''
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--kos", type=int, default=40)
+    parser.add_argument("--parameters", type=int, default=6)
+    parser.add_argument("--fields", type=int, default=500)
+    parser.add_argument("--records", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    rng = random.Random(args.seed)
+
+    fields = [f"field_{i}" for i in range(args.fields)]
+    source = HEADER + "".join(
+        KO_SOURCE.format(i=i, parameters=", ".join(rng.sample(fields, args.parameters)))
+        for i in range(args.kos)
+    )
+    package = make_package("benchmark_field_plan", source, ko_metadata("benchmark-field-plan"))
+    knowledgebase = package.Benchmark_KnowledgeBase("benchmark")
+    for i in range(args.kos):
+        knowledgebase.add_knowledge_object(getattr(package, f"Benchmark_KO_{i}")())
+
+    records = [{field: rng.randrange(100) for field in fields} for _ in range(args.records)]
+    knowledge_objects = knowledgebase.knowledge_objects
+
+    def full_records():
+        return [
+            {name: knowledge_object.execute(record) for name, knowledge_object in knowledge_objects.items()}
+            for record in records
+        ]
+
+    def field_plan():
+        return [knowledgebase.calculate_for_all(record, False) for record in records]
+
+    assert full_records()[:10] == field_plan()[:10]
+    full = timed(full_records, 3)
+    planned = timed(field_plan, 3)
+
+    per_record = 1e6 / len(records)
+    print(f"{args.kos} KOs of {args.parameters} parameters, {args.records} records of {args.fields} fields")
+    print(f"calculate_for_all, full record: {full * per_record:10.1f} us/record")
+    print(f"calculate_for_all, field plan:  {planned * per_record:10.1f} us/record")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+Memory of a collection of KOs with large metadata.
+
+Creates a collection of KO packages, each with its own metadata file holding many
+documentation entries, and measures with tracemalloc the memory held by their
+instances, and the time of get_id. The metadata of each file is parsed once and shared
+by the instances of its KO; for comparison, the per-instance copies and the re-reading
+of the metadata file on get_id of earlier versions are emulated. With one instance per
+KO both hold one parsed copy of each file, sharing only saves memory when a KO is
+instantiated several times (--instances).
+
+    python benchmarks/memory.py --kos 1000 --instances 1 --documentation 200
+"""
+
+import argparse
+import gc
+import importlib.resources as resources
+import json
+import time
+import tracemalloc
+
+from common import ko_metadata, make_package
+
+SOURCE = '''
+from kgrid_sdk import Ko_Execution
+
+
+class Benchmark_KO(Ko_Execution):
+    def __init__(self):
+        super().__init__([self.identity])
+
+    @staticmethod
+    def identity(x):
+        return x
+'''
+
+
+def traced_memory(create):
+    # Memory still allocated by the objects returned by `create`, in bytes
+    gc.collect()
+    tracemalloc.start()
+    objects = create()
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del objects
+    return current
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--kos", type=int, default=1000)
+    parser.add_argument("--instances", type=int, default=1, help="instances of each KO")
+    parser.add_argument("--documentation", type=int, default=200)
+    args = parser.parse_args()
+
+    packages = []
+    for i in range(args.kos):
+        documentation = [
+            {"@id": f"docs/page-{j}.md", "dc:title": f"{i}-{j}" + "t" * 50, "dc:description": "d" * 200}
+            for j in range(args.documentation)
+        ]
+        packages.append(
+            make_package(
+                f"benchmark_memory_{i}", SOURCE, ko_metadata(f"benchmark-memory-{i}", hasDocumentation=documentation)
+            )
+        )
+    ko_classes = [package.Benchmark_KO for package in packages]
+    metadata_paths = [ko_class.get_metadata_path() for ko_class in ko_classes]
+
+    def per_instance_copies():
+        # Each instance holding its own parsed metadata
+        instances = []
+        for ko_class, metadata_path in zip(ko_classes, metadata_paths):
+            for _ in range(args.instances):
+                instance = ko_class()
+                with open(metadata_path, "r") as file:
+                    instances.append((instance, json.load(file)))
+        return instances
+
+    # Measured first, so that the shared metadata is parsed (and counted) here
+    shared = traced_memory(
+        lambda: [ko_class() for ko_class in ko_classes for _ in range(args.instances)]
+    )
+    copies = traced_memory(per_instance_copies)
+
+    started = time.perf_counter()
+    for ko_class in ko_classes:
+        ko_class.get_id()
+    get_id = time.perf_counter() - started
+    started = time.perf_counter()
+    for package in packages:
+        # Locating the package and parsing the file on each call
+        path = resources.files(package.__name__) / "metadata.json"
+        if path.exists():
+            with open(path, "r") as file:
+                json.load(file).get("@id")
+    reread = time.perf_counter() - started
+
+    print(
+        f"{args.kos} KOs with {args.documentation} documentation entries, "
+        f"{args.instances} instance(s) of each"
+    )
+    print(f"memory, per-instance metadata:   {copies / 1e6:8.1f} MB")
+    print(f"memory, shared metadata:         {shared / 1e6:8.1f} MB")
+    print(f"get_id, re-reading the metadata: {reread * 1000:8.1f} ms")
+    print(f"get_id, shared metadata:         {get_id * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
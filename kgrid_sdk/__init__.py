@@ -1,4 +1,5 @@
 from .ko import Ko
 from .ko_execution import Ko_Execution
 from .ko_api import Ko_API
-from .ko_cli import Ko_CLI
\ No newline at end of file
+from .ko_cli import Ko_CLI
+from .applicability import applicable_when
\ No newline at end of file
@@ -0,0 +1,137 @@
+import asyncio
+import math
+import time
+from collections import deque
+
+DEADLINE_HEADER = "x-request-deadline"  # absolute deadline, seconds since the epoch
+TIMEOUT_HEADER = "x-request-timeout"  # relative deadline, seconds from now
+
+
+class AdmissionRejected(Exception):
+    def __init__(self, status_code: int, retry_after: float, reason: str):
+        super().__init__(reason)
+        self.status_code = status_code
+        self.retry_after = max(1, math.ceil(retry_after))
+        self.reason = reason
+
+
+class AdmissionController:
+    """
+    Concurrency limit with a bounded, deadline-aware wait queue for one endpoint.
+
+    At most `max_concurrency` requests execute at a time and at most `max_queue` wait
+    for a slot. A request is rejected with 429 when the queue is full, and with 503
+    when its deadline (sent by the client, or `default_timeout`) cannot be met: either
+    the expected wait, estimated from recent execution times, already exceeds it, or
+    it expires while waiting.
+    """
+
+    EWMA_WEIGHT = 0.2
+
+    def __init__(self, max_concurrency: int, max_queue: int = 0, default_timeout: float = None):
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.default_timeout = default_timeout
+        self.in_flight = 0
+        self._waiters = deque()
+        self.service_time = 0.0  # moving average of execution time, seconds
+        # metrics
+        self.admitted = 0
+        self.queued = 0
+        self.shed_queue_full = 0
+        self.shed_deadline = 0
+        self.total_queue_wait = 0.0
+
+    def deadline_from_headers(self, headers):
+        # Converts the client deadline to the monotonic clock
+        now = time.monotonic()
+        try:
+            if DEADLINE_HEADER in headers:
+                return now + float(headers[DEADLINE_HEADER]) - time.time()
+            if TIMEOUT_HEADER in headers:
+                return now + float(headers[TIMEOUT_HEADER])
+        except ValueError:
+            pass
+        return now + self.default_timeout if self.default_timeout else None
+
+    def expected_wait(self, position: int):
+        return position / self.max_concurrency * self.service_time
+
+    async def acquire(self, deadline: float = None):
+        now = time.monotonic()
+        if deadline is not None and deadline <= now:
+            self.shed_deadline += 1
+            raise AdmissionRejected(503, self.service_time, "Request deadline already expired")
+        if self.in_flight < self.max_concurrency and not self._waiters:
+            self.in_flight += 1
+            self.admitted += 1
+            return
+        if len(self._waiters) >= self.max_queue:
+            self.shed_queue_full += 1
+            raise AdmissionRejected(
+                429, self.expected_wait(len(self._waiters) + 1), "Too many queued requests"
+            )
+        expected_wait = self.expected_wait(len(self._waiters) + 1)
+        if deadline is not None and now + expected_wait + self.service_time > deadline:
+            self.shed_deadline += 1
+            raise AdmissionRejected(503, expected_wait, "Request deadline cannot be met")
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        self.queued += 1
+        try:
+            await asyncio.wait_for(
+                asyncio.shield(waiter), None if deadline is None else deadline - now
+            )
+        except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+            if waiter.done():  # the slot was handed over just as the wait ended
+                self.release()
+            else:
+                waiter.cancel()
+                self._waiters.remove(waiter)
+            if isinstance(e, asyncio.CancelledError):
+                raise
+            self.shed_deadline += 1
+            raise AdmissionRejected(
+                503, self.expected_wait(len(self._waiters)), "Request deadline expired in queue"
+            )
+        self.total_queue_wait += time.monotonic() - now
+        self.admitted += 1
+
+    def release(self):
+        # Hand the slot over to the next waiter, if any
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self.in_flight -= 1
+
+    def record(self, duration: float):
+        self.service_time += self.EWMA_WEIGHT * (duration - self.service_time)
+
+    async def run(self, call, deadline: float = None):
+        # Executes the `call` coroutine function once a slot is available
+        await self.acquire(deadline)
+        started = time.monotonic()
+        try:
+            return await call()
+        finally:
+            self.record(time.monotonic() - started)
+            self.release()
+
+    def get_metrics(self):
+        return {
+            "max_concurrency": self.max_concurrency,
+            "max_queue": self.max_queue,
+            "in_flight": self.in_flight,
+            "waiting": len(self._waiters),
+            "admitted": self.admitted,
+            "queued": self.queued,
+            "shed_queue_full": self.shed_queue_full,
+            "shed_deadline": self.shed_deadline,
+            "mean_queue_wait_ms": 1000 * self.total_queue_wait / self.queued if self.queued else 0,
+            "mean_service_time_ms": 1000 * self.service_time,
+        }
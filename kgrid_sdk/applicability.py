@@ -0,0 +1,158 @@
+import bisect
+
+APPLICABILITY_KEY = "applicability"  # key of the applicability predicates in KO metadata
+
+
+def applicable_when(**predicates):
+    """
+    Class decorator declaring cheap applicability predicates for a knowledge object.
+
+    Each keyword names an input field. A tuple `(min, max)` declares an inclusive
+    interval (use None for an open end), a list or set declares the allowed values
+    and any other value declares a single allowed value. For example:
+
+        @applicable_when(age=(65, 75), gender=1)
+        class Abdominal_aortic_aneurysm_screening(Ko_API): ...
+    """
+
+    def decorator(cls):
+        cls.applicability = normalize_predicates(predicates)
+        return cls
+
+    return decorator
+
+
+def normalize_predicates(predicates):
+    # Convert decorator or metadata style predicates to {"field": {"min", "max"} | {"in"}}
+    normalized = {}
+    for field, predicate in (predicates or {}).items():
+        if isinstance(predicate, dict):
+            if "in" in predicate:
+                normalized[field] = {"in": list(predicate["in"])}
+            else:
+                normalized[field] = {
+                    "min": predicate.get("min"),
+                    "max": predicate.get("max"),
+                }
+        elif isinstance(predicate, tuple):
+            if len(predicate) != 2:
+                raise ValueError(
+                    f"Interval predicate for '{field}' must be a (min, max) tuple"
+                )
+            normalized[field] = {"min": predicate[0], "max": predicate[1]}
+        elif isinstance(predicate, (list, set, frozenset)):
+            normalized[field] = {"in": list(predicate)}
+        else:
+            normalized[field] = {"in": [predicate]}
+    return normalized
+
+
+class _IntervalIndex:
+    # Elementary-segment index: the boundaries of all intervals split the number line
+    # into segments, and each segment stores the set of KOs whose interval covers it.
+    def __init__(self, intervals, unconstrained):
+        points = sorted(
+            {bound for low, high in intervals.values() for bound in (low, high) if bound is not None}
+        )
+        self.points = points
+        # segment 2k is the open range before points[k] and segment 2k+1 is points[k]
+        self.segments = [
+            frozenset(
+                set(unconstrained)
+                | {
+                    name
+                    for name, (low, high) in intervals.items()
+                    if self._covers(low, high, segment, points)
+                }
+            )
+            for segment in range(2 * len(points) + 1)
+        ]
+
+    @staticmethod
+    def _covers(low, high, segment, points):
+        if segment % 2:
+            value_low = value_high = points[segment // 2]
+            low_ok = low is None or low <= value_low
+            high_ok = high is None or value_high <= high
+        else:
+            k = segment // 2
+            left = points[k - 1] if k > 0 else None
+            right = points[k] if k < len(points) else None
+            low_ok = low is None or (left is not None and low <= left)
+            high_ok = high is None or (right is not None and right <= high)
+        return low_ok and high_ok
+
+    def lookup(self, value):
+        i = bisect.bisect_left(self.points, value)
+        if i < len(self.points) and self.points[i] == value:
+            return self.segments[2 * i + 1]
+        return self.segments[2 * i]
+
+
+class _ValueIndex:
+    # Bitmap style index: allowed value -> set of KOs, plus KOs without a constraint
+    def __init__(self, allowed_values, unconstrained):
+        self.unconstrained = frozenset(unconstrained)
+        self.by_value = {}
+        for name, values in allowed_values.items():
+            for value in values:
+                self.by_value.setdefault(value, set()).add(name)
+        self.by_value = {
+            value: frozenset(names) | self.unconstrained
+            for value, names in self.by_value.items()
+        }
+
+    def lookup(self, value):
+        try:
+            return self.by_value.get(value, self.unconstrained)
+        except TypeError:  # unhashable input value
+            return self.unconstrained
+
+
+class ApplicabilityIndex:
+    """
+    Index compiled from the applicability predicates of a set of knowledge objects.
+
+    `candidates(patient_data)` returns the names of the KOs whose predicates all hold
+    for the patient. A field missing from the patient data never excludes a KO, so
+    KOs are only skipped when the data proves them inapplicable.
+    """
+
+    def __init__(self, predicates_by_name: dict):
+        self.names = frozenset(predicates_by_name)
+        self.indexes = {}
+        fields = {field for predicates in predicates_by_name.values() for field in predicates}
+        for field in fields:
+            intervals, allowed_values, unconstrained = {}, {}, set()
+            for name, predicates in predicates_by_name.items():
+                predicate = predicates.get(field)
+                if predicate is None:
+                    unconstrained.add(name)
+                elif "in" in predicate:
+                    allowed_values[name] = predicate["in"]
+                else:
+                    intervals[name] = (predicate.get("min"), predicate.get("max"))
+            # A field may mix interval and value predicates across KOs
+            self.indexes[field] = [
+                index
+                for index in (
+                    _IntervalIndex(intervals, unconstrained | set(allowed_values)) if intervals else None,
+                    _ValueIndex(allowed_values, unconstrained | set(intervals)) if allowed_values else None,
+                )
+                if index is not None
+            ]
+
+    def candidates(self, patient_data: dict):
+        candidates = self.names
+        for field, indexes in self.indexes.items():
+            value = patient_data.get(field)
+            if value is None:
+                continue
+            for index in indexes:
+                try:
+                    candidates = candidates & index.lookup(value)
+                except TypeError:  # value not comparable with the interval bounds
+                    continue
+            if not candidates:
+                break
+        return candidates
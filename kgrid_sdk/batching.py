@@ -0,0 +1,91 @@
+import asyncio
+import time
+from typing import Callable
+
+
+class MicroBatcher:
+    """
+    Coalesces concurrent requests into small batches for a vectorized knowledge function.
+
+    Requests wait at most `max_wait_ms` for other requests to join their batch, and a
+    batch is executed as soon as it reaches `max_batch_size`. `batch_function` takes a
+    list of inputs and returns the list of results in the same order; it runs in the
+    default executor so the event loop keeps accepting requests.
+    """
+
+    def __init__(self, batch_function: Callable, max_batch_size: int = 32, max_wait_ms: float = 2.0):
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+        self.batch_function = batch_function
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self._pending = []  # (input, future, enqueued_at)
+        self._timer = None
+        self._tasks = set()  # running batches, referenced until done so they are not collected
+        # metrics
+        self.batches = 0
+        self.requests = 0
+        self.batch_sizes: dict[int, int] = {}
+        self.total_queue_wait = 0.0
+        self.max_queue_wait = 0.0
+
+    async def submit(self, input):
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((input, future, time.perf_counter()))
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_wait, self._flush)
+        return await future
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch = self._pending[: self.max_batch_size]
+        self._pending = self._pending[self.max_batch_size :]
+        if self._pending:
+            self._timer = asyncio.get_running_loop().call_later(self.max_wait, self._flush)
+        if batch:
+            task = asyncio.ensure_future(self._execute(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _execute(self, batch):
+        started = time.perf_counter()
+        self.batches += 1
+        self.requests += len(batch)
+        self.batch_sizes[len(batch)] = self.batch_sizes.get(len(batch), 0) + 1
+        for _, _, enqueued_at in batch:
+            wait = started - enqueued_at
+            self.total_queue_wait += wait
+            self.max_queue_wait = max(self.max_queue_wait, wait)
+
+        try:
+            results = await asyncio.get_running_loop().run_in_executor(
+                None, self.batch_function, [input for input, _, _ in batch]
+            )
+            results = list(results)
+            if len(results) != len(batch):
+                raise ValueError(
+                    f"Batch function returned {len(results)} results for {len(batch)} inputs"
+                )
+        except Exception as e:
+            for _, future, _ in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for (_, future, _), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+    def get_metrics(self):
+        return {
+            "batches": self.batches,
+            "requests": self.requests,
+            "mean_batch_size": self.requests / self.batches if self.batches else 0,
+            "batch_sizes": dict(sorted(self.batch_sizes.items())),
+            "mean_queue_wait_ms": 1000 * self.total_queue_wait / self.requests if self.requests else 0,
+            "max_queue_wait_ms": 1000 * self.max_queue_wait,
+        }
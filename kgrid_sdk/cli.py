@@ -1,7 +1,14 @@
+import functools
 import importlib.metadata
 import json
 import os
+import re
+import subprocess
+import sys
 import tarfile
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 from typing import Optional
@@ -10,7 +17,7 @@ from urllib.parse import urlparse
 import git
 import requests
 import typer
-from jinja2 import Environment
+from jinja2 import DictLoader, Environment
 from pyld import jsonld
 
 cli = typer.Typer()
@@ -143,78 +150,8 @@ def get_filename(url):
     return "undefined"
 
 
-@cli.command()
-def information_page(
-    metadata_path: str = "metadata.json",
-    output: str = "index.html",
-    include_relative_paths: bool = False,
-):
-    """
-    creates knowledge object information page using metadata
-
-    Args:
-        metadata_path (str): Specifies the path to the metadata file. If not provided, the command will look for a file named `metadata.json` in the current directory.
-        output (str): Specifies the output path and file name for the generated information page. If not provided, the page will be saved as `index.html` in the current directory.
-        include_relative_paths (bool): Indicates whether to include links to local files or to the remote GitHub repository, based on the path where the metadata is located.
-    """
-
-    # Load metadata JSON
-    with open(metadata_path, "r", encoding="utf-8") as f:
-        metadata = json.load(f)
-
-    # Expand metadata using JSON-LD for context required expantions
-    base_iri = "."
-    expanded_metadata = jsonld.expand(metadata, {"base": base_iri})
-    unexpanded_metadata = metadata
-    context = {"@context": metadata["@context"]}
-    # Check if context["@context"] is a URL then load it
-    if isinstance(context["@context"], str):
-        # Fetch the external context
-        external_context_url = context["@context"]
-        response = requests.get(external_context_url)
-        external_context = response.json()
-
-        # Replace the external URL in your original context with the external one
-        context["@context"] = external_context
-        
-    # Check if context["@context"] is an array then go through each item
-    if isinstance(context["@context"], list):
-        new_context = []
-        for item in context["@context"]:
-            # Check if item is a URL then load it otherwise add it as is
-            if isinstance(item, str):
-                # Fetch the external context
-                external_context_url = item
-                response = requests.get(external_context_url)
-                external_context = response.json()
-
-                # add the external context 
-                new_context.append({"@context":external_context })
-            else:
-                new_context.append({"@context":item })
-        context["@context"] = new_context 
-    # Get the branch URL for links
-    base_iri = get_github_branch_url(metadata_path)
-
-
-    if not base_iri or include_relative_paths:
-        base_iri = "./"
-    if not isinstance(context["@context"], list):
-        metadata = expand_metadata(metadata, {"base": base_iri, "expandContext": context})
-    if isinstance(context["@context"], list):
-        for ctx in context["@context"]:
-            metadata = expand_metadata(metadata, {"base": base_iri, "expandContext": ctx})    
-
-    env = Environment()
-    env.filters["filename"] = get_filename
-    # Jinja2 template
-    template = env.from_string("""
-    <!DOCTYPE html>
-    <html lang="en">
-    <head>
-        <meta charset="UTF-8">
-        <meta name="viewport" content="width=device-width, initial-scale=1.0">
-        <title>{{ metadata.get("http://purl.org/dc/elements/1.1/title", [{"@value":"Metadata Page"}])[0]["@value"] }}</title>
+# Parts of the information page templates, shared by the single page and the split pages
+STYLE_TEMPLATE = """
         <style>
         body {
             font-family: Arial, sans-serif;
@@ -293,6 +230,415 @@ def information_page(
             margin-top: 5px;
         }
     </style>
+"""
+
+KNOWLEDGE_ITEM_TEMPLATE = """
+                    {% set hasKnowledgeObject = knowledge.get("https://kgrid.org/koio#hasKnowledgeObject", [{}]) %}
+                    {% set knowledgeType = knowledge.get("@type", ["Undefined"])[0]%}
+                    {% set knowledge_anchor = knowledge.get("@id", "").split('/')[-1] %}
+                    <a id="{{ knowledge_anchor }}"></a>
+                    {% if knowledgeType ==  "https://kgrid.org/koio#KnowledgeSet" and hasKnowledgeObject ==  [{}]%}  
+                        <p><a href='{{ knowledge.get("@id", "") }}' target='_blank'>
+                            <h3> {{ knowledge.get("http://purl.org/dc/elements/1.1/title", [{"@value": knowledge.get("@id", "").split('/')[-1]}])[0]["@value"] }}</h3>
+                        </a>
+                    {% else%}</p>
+                        <p><h3> {{ knowledge.get("http://purl.org/dc/elements/1.1/title", [{"@value": knowledge.get("@id", "").split('/')[-1]}])[0]["@value"] }}</h3></p>
+                    {% endif %}     
+                    <p><strong>ID:</strong> 
+                        {{ knowledge_anchor }}
+                    </p>
+
+                    <p><strong>Type:</strong> 
+                            <a href="{{ knowledge.get("@type", ["Undefined"])[0] }}" target='_blank'>
+                                {{ knowledge.get("@type", ["Undefined"])[0].replace("https://kgrid.org/koio#","") }}
+                            </a>
+                    </p>
+                    {% if knowledge.get("http://purl.org/dc/elements/1.1/description") %}
+                        <p><strong>Description:</strong> {{ knowledge.get("http://purl.org/dc/elements/1.1/description", [{"@value":""}])[0]["@value"] }}</p>
+                    {% endif %}
+                    {% if knowledge.get("http://purl.org/dc/elements/1.1/publisher") %}
+                        <p><strong>Publisher:</strong> 
+                            {{ knowledge.get("http://purl.org/dc/elements/1.1/publisher", [{"@value":"Undefined"}])[0]["@value"] }}
+                        </p>
+                    {% endif %}
+                    {% if knowledge.get("http://purl.org/dc/elements/1.1/date") %}
+                        <p><strong>Date:</strong> 
+                            {{ knowledge.get("http://purl.org/dc/elements/1.1/date", [{"@value":"Undefined"}])[0]["@value"] }}
+                        </p>
+                    {% endif %}
+                    {% set creators = knowledge.get("http://schema.org/creator", [{}]) %}
+                    {% if creators != [{}] %}
+                        <b>Creator:</b>
+                        {% set creators = [creators] if creators is mapping else creators %}   
+                        <ul>                 
+                        {% for creator in creators %} 
+                            <li>  
+                                <p>
+                                {{ creator.get("http://schema.org/givenName",[{"@value":""}])[0]["@value"] }} {{ creator.get("http://schema.org/lastName", [{"@value":""}])[0]["@value"] }} {{ creator.get("http://schema.org/name",[{"@value":""}])[0]["@value"] }}
+                                </p>
+                                {% if creator.get("http://schema.org/affiliation")%}
+                                <p><strong>Affiliation:</strong> 
+                                {{ creator.get("http://schema.org/affiliation",[{"@value":""}])[0]["@value"] }} 
+                                </p>
+                                {% endif %}
+                                {% if knowledge.get("http://schema.org/creator",[{}])[0].get("http://schema.org/email")%}
+                                <p><strong>Email:</strong> 
+                                    <a href="mailto:{{ creator.get("http://schema.org/email", [{"@value":"Undefined"}])[0]["@value"] }}" target='_blank'>
+                                        {{ creator.get("http://schema.org/email", [{"@value":"Undefined"}])[0]["@value"] }}
+                                    </a>
+                                </p>
+                                {% endif %}
+                                {% if creator.get("@id")%}
+                                <p><strong>Website:</strong> 
+                                    <a href="mailto:{{ creator.get("@id", "Undefined") }}" target='_blank'>
+                                        {{ creator.get("@id", "Undefined") }}
+                                    </a>
+                                </p>
+                            </li>      
+                            {% endif %}
+                        {% endfor %}   
+                        </ul>
+                    {% endif %}
+                    {% if knowledge.get("http://purl.org/dc/elements/1.1/source") %}
+                        <p><strong>Source:</strong> 
+                            <a href="{{ knowledge.get("http://purl.org/dc/elements/1.1/source", [{"@value":"Undefined"}])[0]["@value"] }}" target='_blank'>
+                                {{ knowledge.get("http://purl.org/dc/elements/1.1/source", [{"@value":"Undefined"}])[0]["@value"] }}
+                            </a>
+                        </p>
+                    {% endif %}            
+                    {% set isReferencedBys = knowledge.get("http://purl.org/dc/elements/1.1/isReferencedBy", [{}]) %}                  
+                    {% if isReferencedBys != [{}] %}
+                        </p><b>Is referenced by:</b></p>
+                        {% set isReferencedBys = [isReferencedBys] if isReferencedBys is mapping else isReferencedBys %}   
+                        <ul>                 
+                        {% for isReferencedBy in isReferencedBys %} 
+                            <li>     
+                            <a href="{{ isReferencedBy["@value"] }}" target='_blank'>
+                                {{ isReferencedBy["@value"] }}
+                            </a>
+                            </li>
+                        {% endfor %}   
+                        </ul>
+                    {% endif %}
+                    {% if knowledge.get("http://schema.org/endorsers") %}
+                        <p><strong>Endorsers:</strong> 
+                            {{ knowledge.get("http://schema.org/endorsers", [{"@value":"Undefined"}])[0]["@value"] }}
+                        </p>
+                    {% endif %}
+                    {% set implemented_by = knowledge.get("http://www.ebi.ac.uk/swo/SWO_0000085", [{}]) %}                   
+                    {% if implemented_by != [{}]%}
+                        {% set implemented_by = [implemented_by] if implemented_by is mapping else implemented_by %}
+                        <p><strong>Implemented by:</strong> 
+                        <ul>
+                        {% for implementation in implemented_by %}
+                            <li>
+                            <a href="{{ implementation.get("@id", "Undefined") }}" target='_blank'>
+                                {{ implementation.get("http://purl.org/dc/elements/1.1/title") if implementation.get("http://purl.org/dc/elements/1.1/title") else implementation.get("@id", "Undefined") | filename}}
+                            </a><br/>(type: 
+                                {% set imp_types = implementation.get("@type", "Undefined")%}
+                                {% for imp_type in imp_types %}<a href="{{ imp_type }}" target='_blank'>{{ imp_type.replace(base_iri , "").replace("/" , "")}}</a>{% if not loop.last %}, {% endif %}{% endfor %})
+                            </li>
+                        {% endfor %}
+                        </ul>
+                        </p>
+                    {% endif %}                  
+                    {% if hasKnowledgeObject != [{}]%}
+                        <p><strong>Knowledge Objects:</strong> 
+                        <ul>
+                        {% for ko in hasKnowledgeObject %}
+                            <li>
+                            <a href="{{ ko.get("@id", ko.get("@value", "Undefined")) }}" target='_blank'>
+                                {{ ko.get("@id", ko.get("@value", "Undefined")) }}
+                            </a>
+                            </li>
+                        {% endfor %}
+                        </ul>
+                        </p>
+                    {% endif %}                    
+                    {% if knowledge.get("http://purl.obolibrary.org/obo/RO_0002502") %}
+                        <p><strong>Depends on:</strong> {{ knowledge.get("http://purl.obolibrary.org/obo/RO_0002502",  [{}])[0].get("@id", "Undefined").split('/')[-1] }}</p>
+                    {% endif %}
+                    
+                    {% if knowledge.get("http://purl.org/dc/elements/1.1/format") %}
+                    <p><strong>Format:</strong> 
+                        {{ knowledge.get("http://purl.org/dc/elements/1.1/format", [{"@value":"Undefined"}])[0]["@value"] }}
+                    </p>
+                    {% endif %}                   
+"""
+
+SIDE_SECTIONS_TEMPLATE = """
+            <div class="doc-section" id="doc-section">
+            {% if documentation %}
+                <h2>Documentation</h2>
+                <ul>
+                {% for doc in documentation %}
+                    <li>
+                        <h3><a href="{{ doc.get('@id', '#') }}" target='_blank'>{{ doc.get('http://purl.org/dc/elements/1.1/title', [{"@value":"Untitled"}])[0]["@value"] }}</a></h3>
+                        <p>{{ doc.get('http://purl.org/dc/elements/1.1/description', [{"@value":"No description"}])[0]["@value"] }}</p>
+                        {% if doc.get("item_of","")!="" %}
+                            <p><strong>Document of:</strong> {{doc.get("item_of","")[0]["@value"]}} ({{ doc.get("type","") }}) </p>
+                        {% endif %}
+                        <p><strong>Type:</strong> 
+                        {% set imp_types = doc.get('@type', '#')%}
+                        {% for imp_type in imp_types %}  
+                                <a href="{{ imp_type }}" target='_blank'>
+                                    {{ imp_type.replace("https://kgrid.org/koio#","").split("/")[-1]}}
+                                </a>{% if not loop.last %}, {% endif %}
+                        {% endfor %}
+                        <br/><br/>
+                    </li>
+                {% endfor %}
+                </ul>
+            {% else %}
+                <p>No documentation available</p>
+            {% endif %}
+        </div>
+
+            <div class="test-section" id="test-section">
+            {% if tests %}
+                <h2>Tests</h2>
+                <ul>
+                {% for test in tests %}
+                    <li>
+                        <h3><a href="{{ test.get('http://www.ebi.ac.uk/swo/SWO_0000085', [{}])[0].get('@id', '#') }}" target='_blank'>{{ test.get('http://purl.org/dc/elements/1.1/title', [{"@value":"Untitled"}])[0]["@value"] }}</a></h3>
+                        <p>{{ test.get('http://purl.org/dc/elements/1.1/description', [{"@value":"No description"}])[0]["@value"] }}</p>
+                        {% if test.get("item_of","")!="" %}
+                            <p><strong>Test of:</strong> {{test.get("item_of","")[0]["@value"]}} ({{ test.get("type","") }}) </p>
+                        {% endif %}
+                        <p><strong>Type:</strong> 
+                        {% set imp_types = test.get('http://www.ebi.ac.uk/swo/SWO_0000085', [{}])[0].get('@type', '#')%}
+                        {% for imp_type in imp_types %}  
+                                <a href="{{ imp_type }}" target='_blank'>
+                                    {{ imp_type.split("/")[-1]}}
+                                </a>{% if not loop.last %}, {% endif %}
+                        {% endfor %}
+                    </li>
+                {% endfor %}
+                </ul>
+            {% else %}
+                <p>No tests available</p>
+            {% endif %}
+            </div>
+"""
+
+
+KNOWLEDGE_PAGE_TEMPLATE = """
+    <!DOCTYPE html>
+    <html lang="en">
+    <head>
+        <meta charset="UTF-8">
+        <meta name="viewport" content="width=device-width, initial-scale=1.0">
+        <base href="../">
+        <title>{{ knowledge.get("http://purl.org/dc/elements/1.1/title", [{"@value": knowledge.get("@id", "").split('/')[-1]}])[0]["@value"] }}</title>
+        {% include "style.html" %}
+    </head>
+    <body>
+        <div class="container">
+        <div class="left-column">
+            <p><a href="{{ index_page }}">&larr; {{ knowledgebase_title }}</a></p>
+            <hr>
+            {% include "knowledge_item.html" %}
+        </div>
+        <div class="right-column">
+            {% include "side_sections.html" %}
+        </div>
+        </div>
+    </body>
+    </html>
+"""
+
+INDEX_PAGE_TEMPLATE = """
+    <!DOCTYPE html>
+    <html lang="en">
+    <head>
+        <meta charset="UTF-8">
+        <meta name="viewport" content="width=device-width, initial-scale=1.0">
+        <title>{{ title }}</title>
+        {% include "style.html" %}
+    </head>
+    <body>
+        <div class="container">
+        <div class="left-column">
+            <div class="metadata" id="metadata">
+            <h1>{{ title }}</h1>
+            <p>{{ metadata.get("http://purl.org/dc/elements/1.1/description", [{"@value":""}])[0]["@value"].replace("\n", "<br>") }}</p>
+            <p><strong>ID:</strong> {{ unexpanded_metadata.get("@id", "Undefined") }}</p>
+            <p><strong>Version:</strong> {{ metadata.get("http://purl.org/dc/elements/1.1/version", [{"@value":"Undefined"}])[0]["@value"] }}</p>
+            <p><strong>Information page metadata:</strong> <a href="{{base_iri}}/metadata.json" target='_blank'>metadata.json</a></p>
+            </div>
+            <hr>
+            <h2>Knowledge ({{ total }})</h2>
+            <input type="search" id="search" placeholder="Search knowledge by id, title or type" style="width: 100%; padding: 6px;">
+            <ul id="search-results" style="display: none;"></ul>
+            <div id="listing">
+                <ul>
+                {% for entry in entries %}
+                    <li><a href="{{ entry.page }}">{{ entry.title }}</a> ({{ entry.type }})</li>
+                {% endfor %}
+                </ul>
+                <p>
+                {% if page > 1 %}<a href="{{ pages[page - 2] }}">&larr; Previous</a>{% endif %}
+                Page {{ page }} of {{ pages | length }}
+                {% if page < pages | length %}<a href="{{ pages[page] }}">Next &rarr;</a>{% endif %}
+                </p>
+            </div>
+        </div>
+        <div class="right-column">
+            {% include "side_sections.html" %}
+        </div>
+        </div>
+        <script>
+            // The search index is only downloaded once the search box is used
+            var searchIndex = null;
+            var search = document.getElementById("search");
+            function loadSearchIndex() {
+                if (!searchIndex) {
+                    searchIndex = fetch("{{ search_index }}").then(function (response) { return response.json(); });
+                }
+                return searchIndex;
+            }
+            function showResults() {
+                var query = search.value.trim().toLowerCase();
+                var results = document.getElementById("search-results");
+                document.getElementById("listing").style.display = query ? "none" : "";
+                results.style.display = query ? "" : "none";
+                if (!query) return;
+                loadSearchIndex().then(function (index) {
+                    var html = "";
+                    var count = 0;
+                    for (var i = 0; i < index.items.length && count < 100; i++) {
+                        var item = index.items[i];
+                        if ((item[0] + " " + item[1] + " " + item[2]).toLowerCase().indexOf(query) !== -1) {
+                            var link = document.createElement("a");
+                            link.href = item[3];
+                            link.textContent = item[1];
+                            html += "<li>" + link.outerHTML + " (" + item[2] + ")</li>";
+                            count++;
+                        }
+                    }
+                    results.innerHTML = html || "<li>No knowledge found</li>";
+                });
+            }
+            search.addEventListener("focus", loadSearchIndex);
+            search.addEventListener("input", showResults);
+        </script>
+    </body>
+    </html>
+"""
+
+
+def create_template_environment():
+    env = Environment(
+        loader=DictLoader(
+            {
+                "style.html": STYLE_TEMPLATE,
+                "knowledge_item.html": KNOWLEDGE_ITEM_TEMPLATE,
+                "side_sections.html": SIDE_SECTIONS_TEMPLATE,
+                "knowledge_page.html": KNOWLEDGE_PAGE_TEMPLATE,
+                "index_page.html": INDEX_PAGE_TEMPLATE,
+            }
+        )
+    )
+    env.filters["filename"] = get_filename
+    return env
+
+
+def load_information_page_metadata(metadata_path, include_relative_paths=False):
+    """Loads the metadata and expands it with its context for the information page templates."""
+    # Load metadata JSON
+    with open(metadata_path, "r", encoding="utf-8") as f:
+        metadata = json.load(f)
+
+    # Expand metadata using JSON-LD for context required expantions
+    base_iri = "."
+    expanded_metadata = jsonld.expand(metadata, {"base": base_iri})
+    unexpanded_metadata = metadata
+    context = {"@context": metadata["@context"]}
+    # Check if context["@context"] is a URL then load it
+    if isinstance(context["@context"], str):
+        # Fetch the external context
+        external_context_url = context["@context"]
+        external_context = fetch_context(external_context_url)
+
+        # Replace the external URL in your original context with the external one
+        context["@context"] = external_context
+        
+    # Check if context["@context"] is an array then go through each item
+    if isinstance(context["@context"], list):
+        new_context = []
+        for item in context["@context"]:
+            # Check if item is a URL then load it otherwise add it as is
+            if isinstance(item, str):
+                # Fetch the external context
+                external_context_url = item
+                external_context = fetch_context(external_context_url)
+
+                # add the external context 
+                new_context.append({"@context":external_context })
+            else:
+                new_context.append({"@context":item })
+        context["@context"] = new_context 
+    # Get the branch URL for links
+    base_iri = get_github_branch_url(metadata_path)
+
+
+    if not base_iri or include_relative_paths:
+        base_iri = "./"
+    if not isinstance(context["@context"], list):
+        metadata = expand_metadata(metadata, {"base": base_iri, "expandContext": context})
+    if isinstance(context["@context"], list):
+        for ctx in context["@context"]:
+            metadata = expand_metadata(metadata, {"base": base_iri, "expandContext": ctx})
+    return metadata, expanded_metadata, unexpanded_metadata, base_iri
+
+
+@functools.lru_cache(maxsize=None)
+def fetch_context(url):
+    # External JSON-LD contexts are fetched once per process
+    response = requests.get(url)
+    return response.json()
+
+
+@cli.command()
+def information_page(
+    metadata_path: str = "metadata.json",
+    output: str = "index.html",
+    include_relative_paths: bool = False,
+    split: bool = False,
+    page_size: int = 100,
+    workers: int = None,
+):
+    """
+    creates knowledge object information page using metadata
+
+    Args:
+        metadata_path (str): Specifies the path to the metadata file. If not provided, the command will look for a file named `metadata.json` in the current directory.
+        output (str): Specifies the output path and file name for the generated information page. If not provided, the page will be saved as `index.html` in the current directory.
+        include_relative_paths (bool): Indicates whether to include links to local files or to the remote GitHub repository, based on the path where the metadata is located.
+        split (bool): For large knowledgebases, create a paginated index page, one page per knowledge item in a `kos` folder next to it (rendered in parallel) and a compact `search-index.json` loaded by the index page on demand.
+        page_size (int): Number of knowledge items listed per index page when using `--split`. Defaults to 100.
+        workers (int): Number of processes rendering the knowledge item pages when using `--split`. Defaults to the number of CPUs.
+    """
+
+    metadata, expanded_metadata, unexpanded_metadata, base_iri = load_information_page_metadata(
+        metadata_path, include_relative_paths
+    )
+    if split:
+        render_split_information_pages(
+            metadata, unexpanded_metadata, base_iri, output, page_size, workers
+        )
+        return
+
+    env = create_template_environment()
+    # Jinja2 template
+    template = env.from_string("""
+    <!DOCTYPE html>
+    <html lang="en">
+    <head>
+        <meta charset="UTF-8">
+        <meta name="viewport" content="width=device-width, initial-scale=1.0">
+        <title>{{ metadata.get("http://purl.org/dc/elements/1.1/title", [{"@value":"Metadata Page"}])[0]["@value"] }}</title>
+        {% include "style.html" %}
     </head>
     <body>
         <div class="container">
@@ -412,137 +758,7 @@ def information_page(
                 <hr>
                 <h2>Knowledge</h2>
                 {% for knowledge in knowledge_items %}
-                    {% set hasKnowledgeObject = knowledge.get("https://kgrid.org/koio#hasKnowledgeObject", [{}]) %}
-                    {% set knowledgeType = knowledge.get("@type", ["Undefined"])[0]%}
-                    {% set knowledge_anchor = knowledge.get("@id", "").split('/')[-1] %}
-                    <a id="{{ knowledge_anchor }}"></a>
-                    {% if knowledgeType ==  "https://kgrid.org/koio#KnowledgeSet" and hasKnowledgeObject ==  [{}]%}  
-                        <p><a href='{{ knowledge.get("@id", "") }}' target='_blank'>
-                            <h3> {{ knowledge.get("http://purl.org/dc/elements/1.1/title", [{"@value": knowledge.get("@id", "").split('/')[-1]}])[0]["@value"] }}</h3>
-                        </a>
-                    {% else%}</p>
-                        <p><h3> {{ knowledge.get("http://purl.org/dc/elements/1.1/title", [{"@value": knowledge.get("@id", "").split('/')[-1]}])[0]["@value"] }}</h3></p>
-                    {% endif %}     
-                    <p><strong>ID:</strong> 
-                        {{ knowledge_anchor }}
-                    </p>
-
-                    <p><strong>Type:</strong> 
-                            <a href="{{ knowledge.get("@type", ["Undefined"])[0] }}" target='_blank'>
-                                {{ knowledge.get("@type", ["Undefined"])[0].replace("https://kgrid.org/koio#","") }}
-                            </a>
-                    </p>
-                    {% if knowledge.get("http://purl.org/dc/elements/1.1/description") %}
-                        <p><strong>Description:</strong> {{ knowledge.get("http://purl.org/dc/elements/1.1/description", [{"@value":""}])[0]["@value"] }}</p>
-                    {% endif %}
-                    {% if knowledge.get("http://purl.org/dc/elements/1.1/publisher") %}
-                        <p><strong>Publisher:</strong> 
-                            {{ knowledge.get("http://purl.org/dc/elements/1.1/publisher", [{"@value":"Undefined"}])[0]["@value"] }}
-                        </p>
-                    {% endif %}
-                    {% if knowledge.get("http://purl.org/dc/elements/1.1/date") %}
-                        <p><strong>Date:</strong> 
-                            {{ knowledge.get("http://purl.org/dc/elements/1.1/date", [{"@value":"Undefined"}])[0]["@value"] }}
-                        </p>
-                    {% endif %}
-                    {% set creators = knowledge.get("http://schema.org/creator", [{}]) %}
-                    {% if creators != [{}] %}
-                        <b>Creator:</b>
-                        {% set creators = [creators] if creators is mapping else creators %}   
-                        <ul>                 
-                        {% for creator in creators %} 
-                            <li>  
-                                <p>
-                                {{ creator.get("http://schema.org/givenName",[{"@value":""}])[0]["@value"] }} {{ creator.get("http://schema.org/lastName", [{"@value":""}])[0]["@value"] }} {{ creator.get("http://schema.org/name",[{"@value":""}])[0]["@value"] }}
-                                </p>
-                                {% if creator.get("http://schema.org/affiliation")%}
-                                <p><strong>Affiliation:</strong> 
-                                {{ creator.get("http://schema.org/affiliation",[{"@value":""}])[0]["@value"] }} 
-                                </p>
-                                {% endif %}
-                                {% if knowledge.get("http://schema.org/creator",[{}])[0].get("http://schema.org/email")%}
-                                <p><strong>Email:</strong> 
-                                    <a href="mailto:{{ creator.get("http://schema.org/email", [{"@value":"Undefined"}])[0]["@value"] }}" target='_blank'>
-                                        {{ creator.get("http://schema.org/email", [{"@value":"Undefined"}])[0]["@value"] }}
-                                    </a>
-                                </p>
-                                {% endif %}
-                                {% if creator.get("@id")%}
-                                <p><strong>Website:</strong> 
-                                    <a href="mailto:{{ creator.get("@id", "Undefined") }}" target='_blank'>
-                                        {{ creator.get("@id", "Undefined") }}
-                                    </a>
-                                </p>
-                            </li>      
-                            {% endif %}
-                        {% endfor %}   
-                        </ul>
-                    {% endif %}
-                    {% if knowledge.get("http://purl.org/dc/elements/1.1/source") %}
-                        <p><strong>Source:</strong> 
-                            <a href="{{ knowledge.get("http://purl.org/dc/elements/1.1/source", [{"@value":"Undefined"}])[0]["@value"] }}" target='_blank'>
-                                {{ knowledge.get("http://purl.org/dc/elements/1.1/source", [{"@value":"Undefined"}])[0]["@value"] }}
-                            </a>
-                        </p>
-                    {% endif %}            
-                    {% set isReferencedBys = knowledge.get("http://purl.org/dc/elements/1.1/isReferencedBy", [{}]) %}                  
-                    {% if isReferencedBys != [{}] %}
-                        </p><b>Is referenced by:</b></p>
-                        {% set isReferencedBys = [isReferencedBys] if isReferencedBys is mapping else isReferencedBys %}   
-                        <ul>                 
-                        {% for isReferencedBy in isReferencedBys %} 
-                            <li>     
-                            <a href="{{ isReferencedBy["@value"] }}" target='_blank'>
-                                {{ isReferencedBy["@value"] }}
-                            </a>
-                            </li>
-                        {% endfor %}   
-                        </ul>
-                    {% endif %}
-                    {% if knowledge.get("http://schema.org/endorsers") %}
-                        <p><strong>Endorsers:</strong> 
-                            {{ knowledge.get("http://schema.org/endorsers", [{"@value":"Undefined"}])[0]["@value"] }}
-                        </p>
-                    {% endif %}
-                    {% set implemented_by = knowledge.get("http://www.ebi.ac.uk/swo/SWO_0000085", [{}]) %}                   
-                    {% if implemented_by != [{}]%}
-                        {% set implemented_by = [implemented_by] if implemented_by is mapping else implemented_by %}
-                        <p><strong>Implemented by:</strong> 
-                        <ul>
-                        {% for implementation in implemented_by %}
-                            <li>
-                            <a href="{{ implementation.get("@id", "Undefined") }}" target='_blank'>
-                                {{ implementation.get("http://purl.org/dc/elements/1.1/title") if implementation.get("http://purl.org/dc/elements/1.1/title") else implementation.get("@id", "Undefined") | filename}}
-                            </a><br/>(type: 
-                                {% set imp_types = implementation.get("@type", "Undefined")%}
-                                {% for imp_type in imp_types %}<a href="{{ imp_type }}" target='_blank'>{{ imp_type.replace(base_iri , "").replace("/" , "")}}</a>{% if not loop.last %}, {% endif %}{% endfor %})
-                            </li>
-                        {% endfor %}
-                        </ul>
-                        </p>
-                    {% endif %}                  
-                    {% if hasKnowledgeObject != [{}]%}
-                        <p><strong>Knowledge Objects:</strong> 
-                        <ul>
-                        {% for ko in hasKnowledgeObject %}
-                            <li>
-                            <a href="{{ ko.get("@id", ko.get("@value", "Undefined")) }}" target='_blank'>
-                                {{ ko.get("@id", ko.get("@value", "Undefined")) }}
-                            </a>
-                            </li>
-                        {% endfor %}
-                        </ul>
-                        </p>
-                    {% endif %}                    
-                    {% if knowledge.get("http://purl.obolibrary.org/obo/RO_0002502") %}
-                        <p><strong>Depends on:</strong> {{ knowledge.get("http://purl.obolibrary.org/obo/RO_0002502",  [{}])[0].get("@id", "Undefined").split('/')[-1] }}</p>
-                    {% endif %}
-                    
-                    {% if knowledge.get("http://purl.org/dc/elements/1.1/format") %}
-                    <p><strong>Format:</strong> 
-                        {{ knowledge.get("http://purl.org/dc/elements/1.1/format", [{"@value":"Undefined"}])[0]["@value"] }}
-                    </p>
-                    {% endif %}                   
+                    {% include "knowledge_item.html" %}
                 {% endfor %}
             {% endif %}
 
@@ -600,58 +816,7 @@ def information_page(
         </div>            
         </div>
         <div class="right-column">
-            <div class="doc-section" id="doc-section">
-            {% if documentation %}
-                <h2>Documentation</h2>
-                <ul>
-                {% for doc in documentation %}
-                    <li>
-                        <h3><a href="{{ doc.get('@id', '#') }}" target='_blank'>{{ doc.get('http://purl.org/dc/elements/1.1/title', [{"@value":"Untitled"}])[0]["@value"] }}</a></h3>
-                        <p>{{ doc.get('http://purl.org/dc/elements/1.1/description', [{"@value":"No description"}])[0]["@value"] }}</p>
-                        {% if doc.get("item_of","")!="" %}
-                            <p><strong>Document of:</strong> {{doc.get("item_of","")[0]["@value"]}} ({{ doc.get("type","") }}) </p>
-                        {% endif %}
-                        <p><strong>Type:</strong> 
-                        {% set imp_types = doc.get('@type', '#')%}
-                        {% for imp_type in imp_types %}  
-                                <a href="{{ imp_type }}" target='_blank'>
-                                    {{ imp_type.replace("https://kgrid.org/koio#","").split("/")[-1]}}
-                                </a>{% if not loop.last %}, {% endif %}
-                        {% endfor %}
-                        <br/><br/>
-                    </li>
-                {% endfor %}
-                </ul>
-            {% else %}
-                <p>No documentation available</p>
-            {% endif %}
-        </div>
-
-            <div class="test-section" id="test-section">
-            {% if tests %}
-                <h2>Tests</h2>
-                <ul>
-                {% for test in tests %}
-                    <li>
-                        <h3><a href="{{ test.get('http://www.ebi.ac.uk/swo/SWO_0000085', [{}])[0].get('@id', '#') }}" target='_blank'>{{ test.get('http://purl.org/dc/elements/1.1/title', [{"@value":"Untitled"}])[0]["@value"] }}</a></h3>
-                        <p>{{ test.get('http://purl.org/dc/elements/1.1/description', [{"@value":"No description"}])[0]["@value"] }}</p>
-                        {% if test.get("item_of","")!="" %}
-                            <p><strong>Test of:</strong> {{test.get("item_of","")[0]["@value"]}} ({{ test.get("type","") }}) </p>
-                        {% endif %}
-                        <p><strong>Type:</strong> 
-                        {% set imp_types = test.get('http://www.ebi.ac.uk/swo/SWO_0000085', [{}])[0].get('@type', '#')%}
-                        {% for imp_type in imp_types %}  
-                                <a href="{{ imp_type }}" target='_blank'>
-                                    {{ imp_type.split("/")[-1]}}
-                                </a>{% if not loop.last %}, {% endif %}
-                        {% endfor %}
-                    </li>
-                {% endfor %}
-                </ul>
-            {% else %}
-                <p>No tests available</p>
-            {% endif %}
-            </div>
+            {% include "side_sections.html" %}
         </div>
         </div>
     </body>
@@ -680,6 +845,121 @@ def information_page(
     print(f"\033[32m- Knowledge object information page created\033[0m at {output}")
 
 
+KNOWLEDGE_PAGES_DIR = "kos"
+SEARCH_INDEX_FILE = "search-index.json"
+
+_template_environment = None  # built once per rendering process
+
+
+def render_knowledge_pages(items, output_dir, index_page, knowledgebase_title, base_iri):
+    global _template_environment
+    if _template_environment is None:
+        _template_environment = create_template_environment()
+    template = _template_environment.get_template("knowledge_page.html")
+    for knowledge, page in items:
+        title = knowledge.get("http://purl.org/dc/elements/1.1/title", "")
+        knowledge_type = get_object_types(knowledge)
+        html = template.render(
+            knowledge=knowledge,
+            documentation=find_item(knowledge, "https://kgrid.org/koio#hasDocumentation", [], title, knowledge_type),
+            tests=find_item(knowledge, "https://kgrid.org/koio#hasTest", [], title, knowledge_type),
+            index_page=index_page,
+            knowledgebase_title=knowledgebase_title,
+            base_iri=base_iri,
+        )
+        with open(os.path.join(output_dir, page), "w") as f:
+            f.write(html)
+    return len(items)
+
+
+def render_split_information_pages(metadata, unexpanded_metadata, base_iri, output, page_size, workers):
+    """Writes paginated index pages, one page per knowledge item and a search index."""
+    output_dir = os.path.dirname(output) or "."
+    os.makedirs(os.path.join(output_dir, KNOWLEDGE_PAGES_DIR), exist_ok=True)
+    base_iri = os.path.dirname(base_iri)
+    title = metadata.get("http://purl.org/dc/elements/1.1/title", [{"@value": "Metadata Page"}])[0]["@value"]
+    knowledge_items = metadata.get("https://kgrid.org/koio#hasKnowledge", [])
+
+    entries = []
+    used_pages = set()
+    for number, knowledge in enumerate(knowledge_items):
+        anchor = knowledge.get("@id", "").split('/')[-1]
+        slug = re.sub(r"[^A-Za-z0-9._-]", "_", anchor).strip(".") or f"knowledge-{number}"
+        page = f"{KNOWLEDGE_PAGES_DIR}/{slug}.html"
+        if page in used_pages:
+            page = f"{KNOWLEDGE_PAGES_DIR}/{slug}-{number}.html"
+        used_pages.add(page)
+        entries.append(
+            {
+                "id": anchor,
+                "title": knowledge.get("http://purl.org/dc/elements/1.1/title", [{"@value": anchor}])[0]["@value"],
+                "type": knowledge.get("@type", ["Undefined"])[0].replace("https://kgrid.org/koio#", ""),
+                "page": page,
+            }
+        )
+
+    # Knowledge item pages, rendered in chunks by a process pool
+    index_page = os.path.basename(output)
+    items = [(knowledge, entry["page"]) for knowledge, entry in zip(knowledge_items, entries)]
+    workers = workers or os.cpu_count() or 1
+    chunk_size = max(1, -(-len(items) // (workers * 4)))
+    chunks = [items[i : i + chunk_size] for i in range(0, len(items), chunk_size)]
+    if workers == 1 or len(chunks) <= 1:
+        for chunk in chunks:
+            render_knowledge_pages(chunk, output_dir, index_page, title, base_iri)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            list(
+                executor.map(
+                    render_knowledge_pages,
+                    chunks,
+                    *zip(*[(output_dir, index_page, title, base_iri)] * len(chunks)),
+                )
+            )
+
+    # Compact search index, downloaded by the index page only when searching
+    with open(os.path.join(output_dir, SEARCH_INDEX_FILE), "w") as f:
+        json.dump(
+            {
+                "fields": ["id", "title", "type", "page"],
+                "items": [[entry["id"], entry["title"], entry["type"], entry["page"]] for entry in entries],
+            },
+            f,
+            separators=(",", ":"),
+        )
+
+    # Index pages list the knowledge items and the documentation and tests of the knowledgebase itself
+    top_level = {k: v for k, v in metadata.items() if k != "https://kgrid.org/koio#hasKnowledge"}
+    metadata_type = get_object_types(metadata)
+    documentation = find_item(top_level, "https://kgrid.org/koio#hasDocumentation", [], metadata.get("http://purl.org/dc/elements/1.1/title", ""), metadata_type)
+    tests = find_item(top_level, "https://kgrid.org/koio#hasTest", [], metadata.get("http://purl.org/dc/elements/1.1/title", ""), metadata_type)
+    stem, suffix = os.path.splitext(index_page)
+    page_count = max(1, -(-len(entries) // page_size))
+    pages = [index_page] + [f"{stem}-{number}{suffix}" for number in range(2, page_count + 1)]
+    template = create_template_environment().get_template("index_page.html")
+    for number, page in enumerate(pages, start=1):
+        html = template.render(
+            title=title,
+            metadata=metadata,
+            unexpanded_metadata=unexpanded_metadata,
+            entries=entries[(number - 1) * page_size : number * page_size],
+            total=len(entries),
+            page=number,
+            pages=pages,
+            search_index=SEARCH_INDEX_FILE,
+            documentation=documentation,
+            tests=tests,
+            base_iri=base_iri,
+        )
+        with open(os.path.join(output_dir, page), "w") as f:
+            f.write(html)
+
+    print(
+        f"\033[32m- Knowledge object information pages created\033[0m at {output}: "
+        f"{len(pages)} index pages, {len(entries)} knowledge pages in {os.path.join(output_dir, KNOWLEDGE_PAGES_DIR)}"
+    )
+
+
 def expand_metadata(data, base_context):
     return jsonld.expand(data, base_context)[0]  # Return as-is if not a dict or list
 
@@ -810,6 +1090,259 @@ def init(name: str):
     information_page(os.path.join(save_path, "metadata.json"), KOInfo_page)
 
 
+@cli.command()
+def serve(
+    target: str,
+    host: str = "127.0.0.1",
+    port: int = 8000,
+    workers: int = None,
+    reuse_port: bool = False,
+    stats_interval: float = 0,
+    log_level: str = "info",
+    max_startup_failures: int = 5,
+):
+    """
+    Serves a Ko_API app with multiple worker processes.
+
+    Args:
+        target (str): The app to serve as `module:attribute`, where the attribute is a Ko_API instance or class, or an ASGI app.
+        host (str): The host to bind to. Defaults to 127.0.0.1.
+        port (int): The port to bind to. Defaults to 8000.
+        workers (int): Number of worker processes. Defaults to the number of CPUs.
+        reuse_port (bool): Let each worker bind its own socket with SO_REUSEPORT instead of sharing the socket of the master process.
+        stats_interval (float): If set, print the memory of each worker every given number of seconds. Send SIGUSR1 to the master process to print it on demand.
+        log_level (str): Log level of the workers. Defaults to info.
+        max_startup_failures (int): Stop when workers exit within 10 seconds of starting this many times in a row. Restarts after such failures are delayed exponentially. Defaults to 5.
+    """
+    from kgrid_sdk.serve import MultiWorkerServer
+
+    sys.path.insert(0, os.getcwd())
+    MultiWorkerServer(
+        target,
+        host=host,
+        port=port,
+        workers=workers,
+        reuse_port=reuse_port,
+        stats_interval=stats_interval,
+        log_level=log_level,
+        max_startup_failures=max_startup_failures,
+    ).run()
+
+
+@cli.command()
+def test(
+    path: str = ".",
+    workers: int = None,
+    baseline: str = None,
+    update_baseline: bool = False,
+    threshold: float = 0.2,
+):
+    """
+    Runs the tests declared under hasTest in the metadata of one KO or of all KOs in a folder tree, in parallel.
+
+    Args:
+        path (str): A metadata file, or a folder searched recursively for metadata.json files. Defaults to the current directory.
+        workers (int): Number of tests run in parallel. Defaults to the number of CPUs.
+        baseline (str): JSON file with the wall time and peak memory of each test from a previous run. The command fails if a test is slower or uses more memory than its baseline by more than the threshold.
+        update_baseline (bool): Write the timings of this run to the baseline file.
+        threshold (float): Allowed relative regression versus the baseline. Defaults to 0.2 (20%).
+    """
+    tests = discover_tests(path)
+    if not tests:
+        print(f"\033[31mWarning:\033[0m no python tests declared in metadata under {path}")
+        return
+
+    with ThreadPoolExecutor(max_workers=workers or os.cpu_count()) as executor:
+        results = list(executor.map(lambda test: run_test(*test), tests))
+
+    previous = {}
+    if baseline and Path(baseline).exists():
+        with open(baseline, "r", encoding="utf-8") as f:
+            previous = json.load(f)
+
+    failed = False
+    for key, result in results:
+        status = "\033[32mpassed\033[0m" if result["returncode"] == 0 else "\033[31mfailed\033[0m"
+        regressions = find_regressions(result, previous.get(key), threshold)
+        if result["returncode"] != 0 or (regressions and not update_baseline):
+            failed = True
+        print(
+            f"- {key}: {status} in {result['wall_time_s']:.2f} s, "
+            + (
+                f"peak memory {result['peak_memory_kb']} KiB"
+                if result["peak_memory_kb"] is not None
+                else "peak memory not measured"
+            )
+            + "".join(f"\n  \033[31mRegression:\033[0m {regression}" for regression in regressions)
+        )
+        if result["returncode"] != 0:
+            print(result["output"])
+
+    if baseline and update_baseline:
+        previous.update(
+            {
+                key: {"wall_time_s": result["wall_time_s"], "peak_memory_kb": result["peak_memory_kb"]}
+                for key, result in results
+                if result["returncode"] == 0
+            }
+        )
+        with open(baseline, "w", encoding="utf-8") as f:
+            json.dump(previous, f, indent=4)
+        print(f"\033[32m- Baseline saved\033[0m at {baseline}")
+
+    if failed:
+        raise typer.Exit(code=1)
+
+
+@cli.command()
+def validate(
+    path: str = ".",
+    workers: int = None,
+    offline: bool = False,
+    context_cache: str = None,
+    check_files: bool = True,
+    strict: bool = False,
+):
+    """
+    Validates the metadata of one KO or of all KOs in a folder tree, in parallel.
+
+    Args:
+        path (str): A metadata file, or a folder searched recursively for metadata.json files. Defaults to the current directory.
+        workers (int): Number of processes validating metadata files. Defaults to the number of CPUs.
+        offline (bool): Do not download remote contexts, only use the ones in the context cache.
+        context_cache (str): Folder where remote contexts are cached between runs. Defaults to ~/.cache/kgrid/contexts.
+        check_files (bool): Check that the files and folders referenced by implementations, documentation, resources and the license exist. Defaults to True.
+        strict (bool): Fail on warnings as well as on errors.
+    """
+    from kgrid_sdk.validation import default_context_cache, validate_metadata
+
+    metadata_files = find_metadata_files(path)
+    if not metadata_files:
+        print(f"\033[31mWarning:\033[0m no metadata.json found under {path}")
+        return
+    validate_file = functools.partial(
+        validate_metadata,
+        cache_dir=str(context_cache or default_context_cache()),
+        offline=offline,
+        check_files=check_files,
+    )
+    workers = min(workers or os.cpu_count() or 1, len(metadata_files))
+    started = time.perf_counter()
+    if workers == 1:
+        results = list(map(validate_file, metadata_files))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(
+                executor.map(validate_file, metadata_files, chunksize=max(1, len(metadata_files) // (workers * 4)))
+            )
+
+    errors = warnings = 0
+    for metadata_path, issues in zip(metadata_files, results):
+        if not issues:
+            continue
+        print(f"- {metadata_path}")
+        for level, message in issues:
+            if level == "error":
+                errors += 1
+                print(f"  \033[31mError:\033[0m {message}")
+            else:
+                warnings += 1
+                print(f"  \033[33mWarning:\033[0m {message}")
+    print(
+        f"\033[32m- Validated\033[0m {len(metadata_files)} metadata files in {time.perf_counter() - started:.2f} s: "
+        f"{errors} errors, {warnings} warnings"
+    )
+    if errors or (strict and warnings):
+        raise typer.Exit(code=1)
+
+
+def find_metadata_files(path):
+    path = Path(path)
+    if path.is_file():
+        return [path]
+    metadata_files = []
+    for root, dirs, files in os.walk(path):
+        dirs[:] = [d for d in dirs if not d.startswith(".") and d not in ("node_modules", "venv", "__pycache__")]
+        if "metadata.json" in files:
+            metadata_files.append(Path(root) / "metadata.json")
+    return sorted(metadata_files)
+
+
+def discover_tests(path):
+    # (key, KO folder, test path) of every python test implementation declared under hasTest
+    tests, seen = [], set()
+    root = Path(path).resolve()
+    root = root.parent if root.is_file() else root
+    for metadata_path in find_metadata_files(path):
+        with open(metadata_path, "r", encoding="utf-8") as f:
+            metadata = json.load(f)
+        ko_dir = metadata_path.parent.resolve()
+        for test in find_tests(metadata):
+            implementations = test.get("implementedBy", [])
+            for implementation in implementations if isinstance(implementations, list) else [implementations]:
+                test_id = implementation.get("@id") if isinstance(implementation, dict) else implementation
+                if not isinstance(test_id, str):
+                    continue
+                test_path = (ko_dir / test_id).resolve()
+                if test_path not in seen and (test_path.is_dir() or test_path.suffix == ".py"):
+                    seen.add(test_path)
+                    # tests are keyed by their path relative to the searched folder
+                    tests.append((os.path.relpath(test_path, root), ko_dir, test_path))
+    return tests
+
+
+def find_tests(metadata):
+    tests = []
+    if isinstance(metadata, dict):
+        for key, value in metadata.items():
+            if key == "hasTest":
+                tests.extend(item for item in (value if isinstance(value, list) else [value]) if isinstance(item, dict))
+            else:
+                tests.extend(find_tests(value))
+    elif isinstance(metadata, list):
+        for item in metadata:
+            tests.extend(find_tests(item))
+    return tests
+
+
+def run_test(key, ko_dir, test_path):
+    # Runs pytest in its own process; where available, wait4 gives the peak RSS of that
+    # process (ru_maxrss is in KiB on Linux and in bytes on macOS). Without it, e.g. on
+    # Windows, the peak memory is not measured.
+    with tempfile.TemporaryFile() as output:
+        command = [sys.executable, "-m", "pytest", "-q", str(test_path)]
+        started = time.perf_counter()
+        if hasattr(os, "wait4"):
+            process = subprocess.Popen(command, cwd=ko_dir, stdout=output, stderr=subprocess.STDOUT)
+            _, status, usage = os.wait4(process.pid, 0)
+            wall_time = time.perf_counter() - started
+            returncode = process.returncode = os.waitstatus_to_exitcode(status)
+            peak_memory = usage.ru_maxrss // 1024 if sys.platform == "darwin" else usage.ru_maxrss
+        else:
+            returncode = subprocess.run(command, cwd=ko_dir, stdout=output, stderr=subprocess.STDOUT).returncode
+            wall_time = time.perf_counter() - started
+            peak_memory = None
+        output.seek(0)
+        text = output.read().decode(errors="replace")
+    return key, {
+        "returncode": returncode,
+        "wall_time_s": wall_time,
+        "peak_memory_kb": peak_memory,
+        "output": text,
+    }
+
+
+def find_regressions(result, previous, threshold):
+    if not previous or result["returncode"] != 0:
+        return []
+    regressions = []
+    for field, unit, min_delta in (("wall_time_s", "s", 0.05), ("peak_memory_kb", "KiB", 1024)):
+        base, current = previous.get(field), result[field]
+        if base and current is not None and current > base * (1 + threshold) and current - base > min_delta:
+            regressions.append(f"{field} {current:.2f} {unit} vs baseline {base:.2f} {unit}")
+    return regressions
+
+
 # package("/home/faridsei/dev/code/knowledge-base/metadata.json", nested=True)
 # package("/home/faridsei/dev/code/USPSTF-collection/abdominal-aortic-aneurysm-screening/metadata.json", nested=True)
 # information_page(
@@ -833,11 +1366,11 @@ def init(name: str):
 #     False,
 # )
 
-information_page(
-    "/home/faridsei/dev/code/ICPSR-ex1-MIHD/metadata.json",
-    "/home/faridsei/dev/code/ICPSR-ex1-MIHD/index.html",
-    False,
-)
+# information_page(
+#     "/home/faridsei/dev/code/ICPSR-ex1-MIHD/metadata.json",
+#     "/home/faridsei/dev/code/ICPSR-ex1-MIHD/index.html",
+#     False,
+# )
 
 # information_page(
 #     "/home/faridsei/dev/code/nephroticsyndrome-computablephenotype/metadata.json",
@@ -0,0 +1,169 @@
+import os
+import shutil
+import tempfile
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc
+    import pyarrow.parquet as pq
+except ImportError:
+    print("Columnar output not installed. Install with `-E columnar`.")
+
+ROW_ID_COLUMN = "row_id"
+
+
+def cast_to_schema(table, schema):
+    # Safe cast of a table to a schema that includes its columns; the columns it lacks are null
+    return pa.Table.from_arrays(
+        [
+            table.column(field.name).cast(field.type, safe=True)
+            if field.name in table.column_names
+            else pa.nulls(table.num_rows, field.type)
+            for field in schema
+        ],
+        schema=schema,
+    )
+
+
+class ColumnarResultWriter:
+    """
+    Writes knowledgebase results to a Parquet or Arrow IPC file, one row per patient.
+
+    Each output field of a KO becomes a typed column named "<ko id>.<field>" (a KO
+    returning a non-dict value gets a single column named after its id). Results are
+    accumulated column by column and flushed every `row_group_size` rows.
+
+    With a `schema`, row groups are written directly; values are cast safely, so a
+    value that does not fit its column type (e.g. 2.5 in an int64 column) raises, as
+    does a column missing from the schema. Without a schema, the types of each row
+    group are inferred and the row groups are spooled to a temporary folder next to the
+    output; on close the schemas of all row groups are unified (null columns take the
+    type of their values, int64 is promoted to double) and the row groups are cast to
+    the unified schema. Incompatible types (e.g. int and string) raise.
+    """
+
+    FORMATS = ("parquet", "arrow")
+
+    def __init__(self, path, format: str = "parquet", row_group_size: int = 65536, schema=None):
+        if format not in self.FORMATS:
+            raise ValueError(f"Unknown format {format}, use one of {', '.join(self.FORMATS)}")
+        self.path = str(path)
+        self.format = format
+        self.row_group_size = row_group_size
+        self.schema = schema
+        self.rows_written = 0
+        self._writer = None
+        self._columns: dict[str, list] = {}
+        self._rows = 0
+        self._spool = None  # temporary folder of the inferred row groups
+        self._spooled = []  # (file, schema) of each inferred row group
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+    def append(self, row_id, results: dict):
+        columns = self._columns
+        self._column(ROW_ID_COLUMN).append(row_id)
+        for name, output in results.items():
+            if isinstance(output, dict):
+                for field, value in output.items():
+                    self._column(f"{name}.{field}").append(value)
+            else:
+                self._column(name).append(output)
+        self._rows += 1
+        # pad the columns this row has no value for
+        for values in columns.values():
+            if len(values) < self._rows:
+                values.append(None)
+        if self._rows >= self.row_group_size:
+            self.flush()
+
+    def _column(self, name):
+        values = self._columns.get(name)
+        if values is None:
+            # a column first seen in this row group is backfilled with nulls
+            values = self._columns[name] = [None] * self._rows
+        return values
+
+    def flush(self):
+        if not self._rows:
+            return
+        if self.schema is not None:
+            self._write(self._table_for_schema())
+        else:
+            self._spool_row_group()
+        self.rows_written += self._rows
+        self._columns = {}
+        self._rows = 0
+
+    def _table_for_schema(self):
+        unknown = [name for name in self._columns if name not in self.schema.names]
+        if unknown:
+            raise ValueError(f"Columns not in the schema: {', '.join(sorted(unknown))}")
+        return pa.Table.from_arrays(
+            [
+                pa.array(self._columns.get(field.name, [None] * self._rows)).cast(field.type, safe=True)
+                for field in self.schema
+            ],
+            schema=self.schema,
+        )
+
+    def _spool_row_group(self):
+        table = pa.Table.from_pydict({name: pa.array(values) for name, values in self._columns.items()})
+        if self._spool is None:
+            self._spool = tempfile.mkdtemp(
+                prefix=f".{os.path.basename(self.path)}.", dir=os.path.dirname(os.path.abspath(self.path))
+            )
+        file = os.path.join(self._spool, f"{len(self._spooled)}.arrow")
+        with pa.OSFile(file, "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+        self._spooled.append((file, table.schema))
+
+    def _write(self, table):
+        if self._writer is None:
+            if self.format == "parquet":
+                self._writer = pq.ParquetWriter(self.path, table.schema)
+            else:
+                self._writer = pa.ipc.new_file(self.path, table.schema)
+        if self.format == "parquet":
+            self._writer.write_table(table, row_group_size=self.row_group_size)
+        else:
+            self._writer.write_table(table, max_chunksize=self.row_group_size)
+
+    def close(self):
+        try:
+            self.flush()
+            if self._spooled:
+                self.schema = pa.unify_schemas(
+                    [schema for _, schema in self._spooled], promote_options="permissive"
+                )
+                for file, _ in self._spooled:
+                    with pa.memory_map(file) as source:
+                        table = pa.ipc.open_file(source).read_all()
+                    self._write(cast_to_schema(table, self.schema))
+                    os.remove(file)
+                self._spooled = []
+        finally:
+            if self._writer is not None:
+                self._writer.close()
+                self._writer = None
+            self._remove_spool()
+
+    def abort(self):
+        # Releases the writer and the spooled row groups without completing the file
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+        self._remove_spool()
+        self._spooled = []
+
+    def _remove_spool(self):
+        if self._spool is not None:
+            shutil.rmtree(self._spool, ignore_errors=True)
+            self._spool = None
@@ -1,22 +1,430 @@
+import importlib
+import importlib.metadata
+import importlib.util
+import sys
+import threading
+import time
+from pathlib import Path
+from types import MappingProxyType
+
+from kgrid_sdk.applicability import APPLICABILITY_KEY, ApplicabilityIndex, normalize_predicates
+from kgrid_sdk.ko import Ko, load_metadata
+from kgrid_sdk.ko_execution import Ko_Execution
+from kgrid_sdk.profiling import profiler
+from kgrid_sdk.projection import FieldPlan
+from kgrid_sdk.reload import (
+    FileWatcher,
+    NewVersion,
+    find_import_path,
+    find_ko_directory,
+    invalidate_caches,
+    reload_lock,
+    source_files,
+    warm_up,
+)
+
+ENTRY_POINT_GROUP = "kgrid_sdk.knowledge_objects"
+
+
+class LazyKnowledgeObject:
+    """
+    Placeholder for a knowledge object registered by import path ("package.module:attribute").
+
+    Only the KO metadata is read at registration, without importing the KO package. The
+    module is imported and the KO instantiated (if the attribute is a class) on first
+    execution, and the instance can be dropped again with `unload`.
+    """
+
+    __slots__ = (
+        "import_path",
+        "module_name",
+        "attribute",
+        "metadata_file",
+        "metadata",
+        "_instance",
+        "_lock",
+        "last_used",
+        "on_load",
+    )
+
+    METADATA_FILE = "metadata.json"
+
+    def __init__(self, import_path: str, metadata_file=METADATA_FILE):
+        module_name, _, attribute = import_path.partition(":")
+        if not module_name or not attribute:
+            raise ValueError(
+                f"Import path '{import_path}' must have the form 'package.module:attribute'"
+            )
+        self.import_path = import_path
+        self.module_name = module_name
+        self.attribute = attribute
+        self.metadata_file = metadata_file
+        self.metadata = self._read_metadata()
+        self._instance = None
+        self._lock = threading.Lock()
+        self.last_used = None
+        self.on_load = []  # callbacks called with this placeholder when the KO is loaded
+
+    def _read_metadata(self):
+        # Same lookup as Ko.get_metadata, but through the import spec so that the
+        # package is located without being imported
+        package = self.module_name.split(".")[0]
+        spec = importlib.util.find_spec(package)
+        if spec is None:
+            raise FileNotFoundError(f"Error finding {self.metadata_file}: package {package} not found")
+        if spec.submodule_search_locations:
+            package_root = Path(next(iter(spec.submodule_search_locations)))
+        else:
+            package_root = Path(spec.origin).parent
+        metadata_path = package_root / self.metadata_file
+        if not metadata_path.exists():
+            metadata_path = package_root.parent / self.metadata_file
+        if not metadata_path.exists():
+            raise FileNotFoundError(f"Error finding {self.metadata_file}: {metadata_path} not found")
+        return MappingProxyType(load_metadata(metadata_path))
+
+    def get_version(self):
+        return self.metadata.get("dc:version", "Unknown version")
+
+    def get_id(self):
+        return self.metadata.get("@id", "Unknown id")
+
+    def get_metadata(self):
+        return self.metadata
+
+    def get_applicability(self):
+        # Lazy KOs declare applicability in metadata, decorators would need an import
+        return normalize_predicates(self.metadata.get(APPLICABILITY_KEY))
+
+    @property
+    def loaded(self):
+        return self._instance is not None
+
+    def load(self) -> Ko:
+        instance = self._instance
+        if instance is None:
+            loaded = False
+            with self._lock:
+                if self._instance is None:
+                    target = getattr(importlib.import_module(self.module_name), self.attribute)
+                    if isinstance(target, type):
+                        target = target()
+                    if not isinstance(target, Ko):
+                        raise TypeError(f"{self.import_path} must be a Ko instance or subclass")
+                    self._instance = target
+                    loaded = True
+                instance = self._instance
+            if loaded:
+                for callback in self.on_load:
+                    callback(self)
+        self.last_used = time.monotonic()
+        return instance
+
+    def unload(self, release_modules: bool = False):
+        # Releases the instance. A KO instance held by a module attribute stays alive as
+        # long as its module is in sys.modules, so `release_modules` also drops the modules
+        # of the KO package and its cached metadata and resources.
+        with self._lock:
+            self._instance = None
+            if release_modules:
+                package = self.module_name.split(".")[0]
+                directory = find_ko_directory(self.module_name, self.metadata_file)
+                if directory is not None:
+                    invalidate_caches(directory)
+                with reload_lock:  # not while a reload sets the modules of a package aside
+                    for name in [name for name in list(sys.modules) if name == package or name.startswith(package + ".")]:
+                        sys.modules.pop(name, None)
+
+    def reload(self):
+        # A new placeholder for the changed KO, and the new version of its package
+        # (see NewVersion) if this one was loaded
+        new_version = NewVersion(self.import_path, self.metadata_file) if self.loaded else None
+        if new_version is None:
+            directory = find_ko_directory(self.module_name, self.metadata_file)
+            if directory is not None:
+                invalidate_caches(directory)
+        knowledge_object = LazyKnowledgeObject(self.import_path, self.metadata_file)
+        if new_version is not None:
+            knowledge_object._instance = new_version.target
+            knowledge_object.last_used = time.monotonic()
+        return knowledge_object, new_version
+
+    def get_parameter_names(self, knowledge_function: str = None):
+        # Not known until the KO is imported
+        instance = self._instance
+        if instance is None or not hasattr(instance, "get_parameter_names"):
+            return None
+        return instance.get_parameter_names(knowledge_function)
+
+    def execute(self, input: dict, knowledge_function: str = None):
+        return self.load().execute(input, knowledge_function)
+
+    def execute_arguments(self, arguments: dict, knowledge_function: str = None):
+        return self.load().execute_arguments(arguments, knowledge_function)
 
-from kgrid_sdk.ko import Ko
 
 class KnowledgeBase(Ko):
+    # No __slots__, so that a knowledgebase can also be a Ko_API or Ko_CLI
+
     METADATA_FILE = "metadata.json"
-    def __init__(self, knowledgebase_name,metadata_file=METADATA_FILE):
+    def __init__(self, knowledgebase_name,metadata_file=METADATA_FILE, strict_fields=False):
         super().__init__(metadata_file)
         self.knowledgebase_name = knowledgebase_name
         self.metadata_file = metadata_file
-        self.knowledge_objects: dict[str, Ko] = {}      
+        self.knowledge_objects: dict[str, Ko | LazyKnowledgeObject] = {}      
+        self.strict_fields = strict_fields  # raise on missing input fields instead of passing None
+        self._applicability_index = None
+        self._field_plan = None
+        self._watcher = None
     
 
     def add_knowledge_object(self, knowledge_object:Ko):
-        if not isinstance(knowledge_object, Ko):
+        if not isinstance(knowledge_object, (Ko, LazyKnowledgeObject)):
             raise TypeError("Object must inherit from Ko")
         self.knowledge_objects[knowledge_object.get_id()] = knowledge_object
+        self._applicability_index = None  # rebuilt on next use
+        self._field_plan = None
+        if isinstance(knowledge_object, LazyKnowledgeObject):
+            knowledge_object.on_load.append(self._knowledge_object_loaded)
+        if self._watcher is not None:
+            self._watcher.watch(knowledge_object.get_id(), self._source_files(knowledge_object))
 
-    def calculate_for_all(self, patient_data):
-        results = {}
+    def register_knowledge_object(self, import_path: str, metadata_file=METADATA_FILE):
+        # Index the KO by its metadata; it is imported on first execution
+        knowledge_object = LazyKnowledgeObject(import_path, metadata_file)
+        self.add_knowledge_object(knowledge_object)
+        return knowledge_object
+
+    def register_entry_points(self, group: str = ENTRY_POINT_GROUP):
+        # Entry points are declared by KO packages, e.g. with poetry:
+        # [tool.poetry.plugins."kgrid_sdk.knowledge_objects"]
+        # abdominal_aortic_aneurysm_screening = "abdominal_aortic_aneurysm_screening:abdominal_aortic_aneurysm_screening"
+        return [
+            self.register_knowledge_object(entry_point.value)
+            for entry_point in importlib.metadata.entry_points(group=group)
+        ]
+
+    def evict_idle_knowledge_objects(self, max_idle_seconds: float, release_modules: bool = False):
+        # Release lazily loaded KOs that have not been executed recently. With `release_modules`,
+        # the modules of their packages are also dropped from sys.modules, unless the package
+        # holds the knowledgebase itself or another of its loaded KOs. Other code using the
+        # package, e.g. in other threads, must not depend on its modules staying imported.
+        now = time.monotonic()
+        idle, packages_in_use = {}, {type(self).__module__.split(".")[0]}
         for name, knowledge_object in self.knowledge_objects.items():
-            results[name] = knowledge_object.execute(patient_data)
-        return results
\ No newline at end of file
+            if isinstance(knowledge_object, LazyKnowledgeObject):
+                if not knowledge_object.loaded:
+                    continue
+                if now - knowledge_object.last_used > max_idle_seconds:
+                    idle[name] = knowledge_object
+                    continue
+                module_name = knowledge_object.module_name
+            else:
+                module_name = type(knowledge_object).__module__
+            packages_in_use.add(module_name.split(".")[0])
+        for knowledge_object in idle.values():
+            knowledge_object.unload(
+                release_modules and knowledge_object.module_name.split(".")[0] not in packages_in_use
+            )
+        return list(idle)
+
+    def get_applicability_index(self):
+        # Compiled once from the predicates of all KOs and reused until a KO is added
+        if self._applicability_index is None:
+            self._applicability_index = ApplicabilityIndex(
+                {
+                    name: knowledge_object.get_applicability()
+                    for name, knowledge_object in self.knowledge_objects.items()
+                }
+            )
+        return self._applicability_index
+
+    def applicable_knowledge_objects(self, patient_data):
+        candidates = self.get_applicability_index().candidates(patient_data)
+        return [name for name in self.knowledge_objects if name in candidates]
+
+    def get_field_plan(self):
+        # Compiled once from the parameters of all KOs and reused until a KO is added,
+        # loaded or reloaded. Lazily registered KOs that are not loaded yet receive the
+        # full input.
+        return self._get_field_plan()[1]
+
+    def _knowledge_object_loaded(self, knowledge_object):
+        # The parameters of a lazily registered KO are known once it is loaded
+        self._field_plan = None
+
+    def _get_field_plan(self):
+        # The plan is kept with the KOs it was compiled for, so that a calculation
+        # running during a reload uses one consistent set of KOs and plan
+        knowledge_objects = self.knowledge_objects
+        field_plan = self._field_plan
+        if field_plan is None or field_plan[0] is not knowledge_objects:
+            field_plan = self._field_plan = (
+                knowledge_objects,
+                FieldPlan(
+                    {
+                        name: knowledge_object.get_parameter_names()
+                        if hasattr(knowledge_object, "get_parameter_names")
+                        else None
+                        for name, knowledge_object in knowledge_objects.items()
+                    }
+                ),
+                # KOs whose knowledge function can be called with the projected arguments;
+                # the others, e.g. KOs overriding execute, receive the full input
+                frozenset(
+                    name
+                    for name, knowledge_object in knowledge_objects.items()
+                    if _uses_default_execute(knowledge_object)
+                ),
+            )
+        return field_plan
+
+    def check_fields(self, patient_data):
+        """Returns the input fields missing for each KO and the fields of `patient_data` no KO reads."""
+        plan = self.get_field_plan()
+        return {"missing": plan.missing_fields(patient_data), "extra": plan.extra_fields(patient_data)}
+
+    def calculate_for_all(self, patient_data, skip_inapplicable=True, profile=False):
+        if profile or profiler.should_profile():
+            with profiler.capture():
+                return self._calculate_for_all(patient_data, skip_inapplicable)
+        return self._calculate_for_all(patient_data, skip_inapplicable)
+
+    def _calculate_for_all(self, patient_data, skip_inapplicable):
+        # KOs whose applicability predicates rule out this patient are not executed
+        knowledge_objects, plan, direct = self._get_field_plan()
+        if skip_inapplicable:
+            candidates = self.get_applicability_index().candidates(patient_data)
+            names = [name for name in knowledge_objects if name in candidates]
+        else:
+            names = knowledge_objects
+        if self.strict_fields:
+            missing = plan.missing_fields(patient_data, names)
+            if missing:
+                raise ValueError(f"Missing input fields: {missing}")
+        # The fields read by any KO are extracted once and each KO gets its arguments by position
+        values = plan.extract(patient_data)
+        results = {}
+        for name in names:
+            knowledge_object = knowledge_objects[name]
+            if name in direct and name in plan.positions:
+                results[name] = knowledge_object.execute_arguments(plan.arguments(name, values))
+            else:
+                results[name] = knowledge_object.execute(patient_data)
+        return results
+
+    def reload_knowledge_object(self, name: str, warm: bool = True):
+        """
+        Loads the current version of a KO alongside the running one and swaps it in.
+
+        The KO package is imported again in new module objects (see
+        `kgrid_sdk.reload.NewVersion`) and its cached metadata and resources dropped. The
+        new version is warmed up with the test inputs declared in its metadata and kept
+        only if at least one of them succeeds; otherwise the running version is left as
+        it was. Calculations already running finish with the previous version.
+        """
+        with reload_lock:
+            previous = self.knowledge_objects[name]
+            previous_version = previous.version if isinstance(previous, Ko) else previous.get_version()
+            if isinstance(previous, LazyKnowledgeObject):
+                knowledge_object, new_version = previous.reload()
+            else:
+                new_version = NewVersion(find_import_path(previous), previous.metadata_file)
+                knowledge_object = new_version.target
+            try:
+                if warm:
+                    # A lazy KO that was not loaded is imported again on its next execution
+                    instance = knowledge_object._instance if isinstance(knowledge_object, LazyKnowledgeObject) else knowledge_object
+                    result = warm_up(instance) if instance is not None else None
+                    if result is None:
+                        if instance is not None:
+                            print(
+                                f"\033[31mWarning:\033[0m the new version of {name} declares no test inputs "
+                                "and was not validated"
+                            )
+                    elif result[0] == result[1]:
+                        raise RuntimeError(f"All {result[0]} warm-up samples of the new version of {name} failed")
+            except BaseException:
+                if new_version is not None:
+                    new_version.discard()
+                raise
+            if new_version is not None:
+                new_version.activate()
+            # Replace the dict instead of updating it, so running calculations keep theirs
+            new_name = knowledge_object.get_id()
+            knowledge_objects = {}
+            for key, value in self.knowledge_objects.items():
+                if key == name:
+                    knowledge_objects[new_name] = knowledge_object
+                elif key != new_name:
+                    knowledge_objects[key] = value
+            self.knowledge_objects = knowledge_objects
+            self._applicability_index = None
+            self._field_plan = None
+            if isinstance(knowledge_object, LazyKnowledgeObject):
+                knowledge_object.on_load.append(self._knowledge_object_loaded)
+        print(
+            f"\033[32m- Reloaded\033[0m {name}: "
+            f"{previous_version} -> {knowledge_object.get_version()}"
+        )
+        return knowledge_object
+
+    def watch(self, interval: float = 1.0):
+        """Reloads KOs whose metadata or python files change, checking every `interval` seconds."""
+        if self._watcher is None:
+            self._watcher = FileWatcher(self._reload_changed, interval)
+            for name, knowledge_object in self.knowledge_objects.items():
+                self._watcher.watch(name, self._source_files(knowledge_object))
+            self._watcher.start()
+        return self._watcher
+
+    def stop_watching(self):
+        if self._watcher is not None:
+            self._watcher.stop()
+            self._watcher = None
+
+    def _source_files(self, knowledge_object):
+        if isinstance(knowledge_object, LazyKnowledgeObject):
+            return source_files(knowledge_object.module_name, knowledge_object.metadata_file)
+        return source_files(type(knowledge_object).__module__, knowledge_object.metadata_file)
+
+    def _reload_changed(self, name):
+        if name not in self.knowledge_objects:
+            return
+        knowledge_object = self.reload_knowledge_object(name)
+        self._watcher.unwatch(name)
+        self._watcher.watch(knowledge_object.get_id(), self._source_files(knowledge_object))
+
+    def calculate_for_batch(self, patients_data, skip_inapplicable=True):
+        return [
+            self.calculate_for_all(patient_data, skip_inapplicable)
+            for patient_data in patients_data
+        ]
+
+    def calculate_for_population(
+        self,
+        patients_data,
+        output_path,
+        format="parquet",
+        row_group_size=65536,
+        schema=None,
+        id_field=None,
+        skip_inapplicable=True,
+    ):
+        # Streams the results into columnar row groups instead of accumulating dicts;
+        # rows are identified by patients_data[id_field] or by their position
+        from kgrid_sdk.columnar import ColumnarResultWriter
+
+        with ColumnarResultWriter(output_path, format, row_group_size, schema) as writer:
+            for index, patient_data in enumerate(patients_data):
+                writer.append(
+                    patient_data.get(id_field) if id_field else index,
+                    self.calculate_for_all(patient_data, skip_inapplicable),
+                )
+        return writer.rows_written
+
+
+def _uses_default_execute(knowledge_object):
+    if isinstance(knowledge_object, LazyKnowledgeObject):
+        knowledge_object = knowledge_object._instance
+    return isinstance(knowledge_object, Ko_Execution) and type(knowledge_object).execute is Ko_Execution.execute
@@ -1,26 +1,75 @@
 
 import importlib.resources as resources
+import inspect
 import json
+import mmap
+import os
+import threading
+from collections.abc import Mapping
+from pathlib import Path
+from types import MappingProxyType
+
+from kgrid_sdk.applicability import APPLICABILITY_KEY, normalize_predicates
 
 
 
 class Ko:
+    """
+    Base class of knowledge objects.
+
+    The parsed metadata is shared by all KOs read from the same metadata file in the
+    process (see `load_metadata`), so `metadata` is a read-only view of it. Assigning
+    `metadata` stores a dict for this instance only. The id, version, title and
+    description are copied to attributes when the KO is created, and the rest of the
+    metadata is looked up on access.
+    """
+
+    __slots__ = ("metadata_file", "id", "version", "title", "description", "_metadata")
+
     METADATA_FILE = "metadata.json"  # by default it is located in the root of the ko
 
     def __init__(self,  metadata_file=METADATA_FILE):
         self.metadata_file = metadata_file
-        self.metadata = self.get_metadata()   
+        metadata = self.metadata
+        self.id = metadata.get("@id", "Unknown id")
+        self.version = metadata.get("dc:version", "Unknown version")
+        self.title = metadata.get("dc:title", "Unknown title")
+        self.description = metadata.get("dc:description", "Unknown description")
+
+    @property
+    def metadata(self):
+        metadata = getattr(self, "_metadata", None)
+        if metadata is None:
+            return MappingProxyType(self.get_metadata(self.metadata_file))
+        return metadata
+
+    @metadata.setter
+    def metadata(self, metadata):
+        # A per-instance copy, e.g. self.metadata = {**self.metadata, "dc:title": ...}
+        self._metadata = metadata
     
     @classmethod
     def get_version(cls, metadata_file=METADATA_FILE):
-        return cls.get_metadata().get("dc:version", "Unknown version")
+        return cls.get_metadata(metadata_file).get("dc:version", "Unknown version")
     
     @classmethod
     def get_id(cls, metadata_file=METADATA_FILE):
-        return cls.get_metadata().get("@id", "Unknown id")
+        return cls.get_metadata(metadata_file).get("@id", "Unknown id")
     
     @classmethod
-    def get_metadata(cls, metadata_file=METADATA_FILE):
+    def get_applicability(cls, metadata_file=METADATA_FILE):
+        # Predicates declared with @applicable_when take precedence over metadata
+        predicates = getattr(cls, "applicability", None)
+        if predicates is None:
+            predicates = cls.get_metadata(metadata_file).get(APPLICABILITY_KEY)
+        return normalize_predicates(predicates)
+
+    @classmethod
+    def get_metadata_path(cls, metadata_file=METADATA_FILE):
+        metadata_path = _metadata_paths.get((cls, metadata_file))
+        if metadata_path is not None:
+            return metadata_path
+
         module = cls.__module__
         
         # Retrieve the package name from the module (assumes single package)
@@ -28,18 +77,233 @@ class Ko:
         
 
         try:
-            # Check if the resource exists and get its contents
+            # Check if the resource exists
             package_root = resources.files(package)
             metadata_path = package_root / metadata_file
             if not metadata_path.exists():
                 metadata_path = package_root.parent / metadata_file
 
             if metadata_path.exists():
-                with open(metadata_path, "r") as file:
-                    return json.load(file)
+                metadata_path = _metadata_paths[(cls, metadata_file)] = Path(str(metadata_path)).resolve()
+                return metadata_path
             else:
                 raise FileNotFoundError(f"{metadata_path} not found")
         except Exception as e:
             raise FileNotFoundError(f"Error finding {metadata_file}: {str(e)}")
 
-    
\ No newline at end of file
+    @classmethod
+    def get_metadata(cls, metadata_file=METADATA_FILE):
+        # Read-only, since the parsed metadata is shared by all KOs of the process
+        return MappingProxyType(load_metadata(cls.get_metadata_path(metadata_file)))
+
+    @classmethod
+    def get_resource_path(cls, name, metadata_file=METADATA_FILE):
+        # Resources are files referenced by "@id" in the metadata, matched by their
+        # path or file name and resolved towards the location of the metadata
+        metadata_path = cls.get_metadata_path(metadata_file)
+        for reference in _extract_ids(cls.get_metadata(metadata_file)):
+            if reference == name or Path(reference).name == name:
+                path = (metadata_path.parent / reference).resolve()
+                if path.is_file():
+                    return path
+        raise FileNotFoundError(f"Resource {name} is not referenced in {metadata_file}")
+
+    @classmethod
+    def get_test_inputs(cls, metadata_file=METADATA_FILE):
+        # Sample inputs of the tests declared under hasTest whose implementation is a
+        # JSON file holding an input, a list of inputs or {"input": ..., ...} cases
+        return _read_test_inputs(
+            cls.get_metadata_path(metadata_file), _find_items(cls.get_metadata(metadata_file), "hasTest")
+        )
+
+    @classmethod
+    def get_test_inputs_by_knowledge(cls, metadata_file=METADATA_FILE):
+        # Test inputs keyed by the @id of the hasKnowledge item declaring the tests, and
+        # None for the tests declared outside of a hasKnowledge item
+        metadata_path = cls.get_metadata_path(metadata_file)
+        metadata = cls.get_metadata(metadata_file)
+        inputs, seen = {}, set()
+        for knowledge in _find_items(metadata, "hasKnowledge"):
+            if isinstance(knowledge, dict):
+                tests = [test for test in _find_items(knowledge, "hasTest") if id(test) not in seen]
+                seen.update(map(id, tests))
+                inputs.setdefault(knowledge.get("@id"), []).extend(_read_test_inputs(metadata_path, tests))
+        tests = [test for test in _find_items(metadata, "hasTest") if id(test) not in seen]
+        if tests:
+            inputs.setdefault(None, []).extend(_read_test_inputs(metadata_path, tests))
+        return inputs
+
+    @classmethod
+    def get_knowledge_id(cls, knowledge_function=None, metadata_file=METADATA_FILE):
+        # @id of the hasKnowledge item implemented by the file (or a folder holding the file)
+        # of a knowledge function, or of the only hasKnowledge item; None when unknown
+        items = [item for item in _find_items(cls.get_metadata(metadata_file), "hasKnowledge") if isinstance(item, dict)]
+        if len(items) == 1:
+            return items[0].get("@id")
+        try:
+            source = Path(inspect.getsourcefile(knowledge_function)).resolve()
+        except TypeError:
+            return None
+        directory = cls.get_metadata_path(metadata_file).parent
+        for item in items:
+            for reference in _implementations(item):
+                path = (directory / reference).resolve()
+                if path == source or path in source.parents:
+                    return item.get("@id")
+        return None
+
+    @classmethod
+    def resource(cls, name, mode=None, metadata_file=METADATA_FILE):
+        """
+        Returns a file referenced in the KO metadata, loaded lazily and once per process.
+
+        mode is one of "json", "text", "bytes", "mmap" (a read-only memory map) or
+        "numpy" (a read-only memory-mapped array, needs numpy). By default it is
+        derived from the file extension. Memory-mapped resources loaded before a
+        fork share the same physical pages across worker processes.
+        """
+        path = _resource_paths.get((cls, name, metadata_file))
+        if path is None:
+            path = _resource_paths[(cls, name, metadata_file)] = cls.get_resource_path(name, metadata_file)
+        mode = mode or _RESOURCE_MODES.get(path.suffix.lower(), "mmap")
+        key = (path, mode)
+        if key not in _resource_cache:
+            with _resource_lock:
+                if key not in _resource_cache:
+                    _resource_cache[key] = _load_resource(path, mode)
+        return _resource_cache[key]
+
+
+_metadata_cache = {}  # resolved metadata path -> parsed metadata, shared by all KOs
+_metadata_paths = {}  # (KO class, metadata file) -> resolved metadata path
+_metadata_lock = threading.Lock()
+
+
+def load_metadata(metadata_path):
+    """Parses a metadata file once per process and returns the shared, read-only result."""
+    metadata = _metadata_cache.get(metadata_path)
+    if metadata is None:
+        metadata_path = Path(metadata_path).resolve()
+        with _metadata_lock:
+            metadata = _metadata_cache.get(metadata_path)
+            if metadata is None:
+                with open(metadata_path, "r") as file:
+                    metadata = _metadata_cache[metadata_path] = json.load(file)
+    return metadata
+
+
+def invalidate_caches(directory):
+    """
+    Drops the cached metadata, metadata paths and resources located under `directory`,
+    e.g. before reloading the KO stored there, and returns them for `restore_caches`.
+    Objects already handed out stay valid.
+    """
+    directory = Path(directory).resolve()
+    with _metadata_lock:
+        metadata = {path: value for path, value in _metadata_cache.items() if Path(path).is_relative_to(directory)}
+        metadata_paths = {key: path for key, path in _metadata_paths.items() if path.is_relative_to(directory)}
+        for path in metadata:
+            del _metadata_cache[path]
+        for key in metadata_paths:
+            del _metadata_paths[key]
+    with _resource_lock:
+        resources = {key: value for key, value in _resource_cache.items() if key[0].is_relative_to(directory)}
+        resource_paths = {key: path for key, path in _resource_paths.items() if path.is_relative_to(directory)}
+        for key in resources:
+            del _resource_cache[key]
+        for key in resource_paths:
+            del _resource_paths[key]
+    return metadata, metadata_paths, resources, resource_paths
+
+
+def restore_caches(dropped):
+    """Puts back the entries returned by `invalidate_caches`, e.g. when a reload is rolled back."""
+    metadata, metadata_paths, resources, resource_paths = dropped
+    with _metadata_lock:
+        _metadata_cache.update(metadata)
+        _metadata_paths.update(metadata_paths)
+    with _resource_lock:
+        _resource_cache.update(resources)
+        _resource_paths.update(resource_paths)
+
+
+_RESOURCE_MODES = {
+    ".json": "json",
+    ".txt": "text",
+    ".csv": "text",
+    ".tsv": "text",
+    ".md": "text",
+    ".npy": "numpy",
+}
+_resource_cache = {}  # (path, mode) -> loaded resource, shared by all KOs in the process
+_resource_paths = {}  # (KO class, name, metadata file) -> resolved resource path
+_resource_lock = threading.Lock()
+
+
+def _load_resource(path: Path, mode: str):
+    if mode == "json":
+        with open(path, "r") as file:
+            return json.load(file)
+    if mode == "text":
+        return path.read_text()
+    if mode == "bytes":
+        return path.read_bytes()
+    if mode == "mmap":
+        with open(path, "rb") as file:
+            if os.fstat(file.fileno()).st_size == 0:
+                return b""  # empty files cannot be memory mapped
+            return mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    if mode == "numpy":
+        try:
+            import numpy
+        except ImportError:
+            raise ImportError("Loading numpy resources requires numpy to be installed.")
+        return numpy.load(path, mmap_mode="r")
+    raise ValueError(f"Unknown resource mode: {mode}")
+
+
+def _extract_ids(metadata):
+    if isinstance(metadata, Mapping):
+        if isinstance(metadata.get("@id"), str):
+            yield metadata["@id"]
+        for value in metadata.values():
+            yield from _extract_ids(value)
+    elif isinstance(metadata, list):
+        for item in metadata:
+            yield from _extract_ids(item)
+
+
+def _implementations(item):
+    # @id of the implementedBy values of a metadata item
+    implementations = item.get("implementedBy", []) if isinstance(item, dict) else []
+    for implementation in implementations if isinstance(implementations, list) else [implementations]:
+        reference = implementation.get("@id", "") if isinstance(implementation, dict) else implementation
+        if isinstance(reference, str) and reference:
+            yield reference
+
+
+def _read_test_inputs(metadata_path, tests):
+    inputs = []
+    for test in tests:
+        for reference in _implementations(test):
+            path = metadata_path.parent / reference
+            if not reference.endswith(".json") or not path.is_file():
+                continue
+            with open(path, "r") as file:
+                cases = json.load(file)
+            for case in cases if isinstance(cases, list) else [cases]:
+                if isinstance(case, dict):
+                    inputs.append(case.get("input", case))
+    return inputs
+
+
+def _find_items(metadata, key):
+    if isinstance(metadata, Mapping):
+        for k, value in metadata.items():
+            if k == key:
+                yield from value if isinstance(value, list) else [value]
+            else:
+                yield from _find_items(value, key)
+    elif isinstance(metadata, list):
+        for item in metadata:
+            yield from _find_items(item, key)
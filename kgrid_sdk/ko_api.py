@@ -1,27 +1,64 @@
+import asyncio
+import hmac
+import os
+import time
+
 try:
-    from fastapi import FastAPI, Request
-    from fastapi.responses import RedirectResponse
+    from fastapi import FastAPI, HTTPException, Request
+    from fastapi.concurrency import run_in_threadpool
+    from fastapi.responses import JSONResponse, RedirectResponse
 except ImportError:
     print("API functionality not installed. Install with `-E api`.")
 
+from kgrid_sdk.admission import AdmissionController, AdmissionRejected
+from kgrid_sdk.batching import MicroBatcher
 from kgrid_sdk.ko_execution import Ko_Execution
+from kgrid_sdk.profiling import profiler
+from kgrid_sdk.reload import FileWatcher, NewVersion, find_import_path, reload_lock, source_files
+
+DEBUG_TOKEN_ENV = "KGRID_DEBUG_TOKEN"
 
 
 class Ko_API(Ko_Execution):
     METADATA_FILE = "metadata.json" 
-    def __init__(self,  knowledges, metadata_file=METADATA_FILE):
+    def __init__(self,  knowledges, metadata_file=METADATA_FILE, warm_up=True):
         super().__init__(knowledges,metadata_file)
+        self.batchers: dict[str, MicroBatcher] = {}
+        self.admission_controllers: dict[str, AdmissionController] = {}
+        self.endpoint_calls = {}  # path -> coroutine function executing the endpoint, swapped on reload
+        self.endpoint_functions = {}  # path -> name of the knowledge function of the endpoint
+        self.warm_up_enabled = warm_up
+        self.warm_up_samples: dict[str, list] = {}  # path -> sample inputs
+        self.knowledge_samples: dict[str, list] = {}  # knowledge function name -> sample inputs
+        self.warm_up_report = None
+        self.ready = False
+        self.import_path = None  # "module:attribute" re-imported on reload
+        self.hot_reload_interval = None
         
         self.app = FastAPI(
-            title=self.metadata.get("dc:title", "Unknown title"),
-            description=self.metadata.get("dc:description", "Unknown description"),
-            version=self.get_version(),
+            title=self.title,
+            description=self.description,
+            version=self.version,
             contact={"name": self.metadata.get("contributors", "Unknown contact")},
         )
+        # Registered as event handlers, so that handlers added with on_event still run
+        self._background_tasks = []
+        self.app.router.on_startup.append(self._start_background_tasks)
+        self.app.router.on_shutdown.append(self._stop_background_tasks)
         self._setup_routes()       
     
 
 
+    async def _start_background_tasks(self):
+        # Warm up in the background so that /health answers while /ready is still 503
+        self._background_tasks.append(asyncio.create_task(self.warm_up()))
+        if self.hot_reload_interval:
+            self._background_tasks.append(asyncio.create_task(self._watch_for_changes()))
+
+    async def _stop_background_tasks(self):
+        while self._background_tasks:
+            self._background_tasks.pop().cancel()
+
     ### API service methods
     def _setup_routes(self):
         # Root route to redirect to docs
@@ -29,21 +66,248 @@ class Ko_API(Ko_Execution):
         async def root(request: Request):
             return RedirectResponse(url="/docs")
 
+        # Liveness, and readiness once the warm-up has completed
+        @self.app.get("/health", include_in_schema=False)
+        async def health():
+            return {"status": "ok"}
+
+        @self.app.get("/ready", include_in_schema=False)
+        async def ready():
+            if not self.ready:
+                return JSONResponse(status_code=503, content={"status": "warming up"})
+            return {"status": "ready", "warm_up": self.warm_up_report}
+
+        # Achieved batch sizes and queueing latency of micro-batched endpoints
+        @self.app.get("/metrics/batching", include_in_schema=False)
+        async def batching_metrics():
+            return {path: batcher.get_metrics() for path, batcher in self.batchers.items()}
+
+        # Shed and queued requests of endpoints with admission control
+        @self.app.get("/metrics/admission", include_in_schema=False)
+        async def admission_metrics():
+            return {
+                path: controller.get_metrics()
+                for path, controller in self.admission_controllers.items()
+            }
+
+        @self.app.exception_handler(AdmissionRejected)
+        async def admission_rejected(request: Request, exc: AdmissionRejected):
+            return JSONResponse(
+                status_code=exc.status_code,
+                content={"detail": exc.reason},
+                headers={"Retry-After": str(exc.retry_after)},
+            )
+
     def add_endpoint(
-        self, path: str, knowledge_function: str = None, methods=["POST"], tags=None
+        self,
+        path: str,
+        knowledge_function: str = None,
+        methods=["POST"],
+        tags=None,
+        batch_function: str = None,
+        max_batch_size: int = 32,
+        max_wait_ms: float = 2.0,
+        max_concurrency: int = None,
+        max_queue: int = 0,
+        timeout: float = None,
     ):  # if multiple knowledge functions, mention the function name
-        # Add a custom endpoint to the app
-        self.app.add_api_route(
-            path,
-            self.create_wrapper(
+        self.endpoint_functions[path] = batch_function or knowledge_function or next(iter(self.knowledges))
+        if batch_function:
+            # Coalesce concurrent requests into batches for the vectorized function
+            batcher = MicroBatcher(
+                self.create_batch_wrapper(self.knowledges[batch_function]),
+                max_batch_size=max_batch_size,
+                max_wait_ms=max_wait_ms,
+            )
+            self.batchers[path] = batcher
+            call = batcher.submit
+        else:
+            wrapper = self.create_wrapper(
                 self.knowledges[knowledge_function]
                 if knowledge_function
                 else next(iter(self.knowledges.values()))
-            ),
+            )
+
+            async def call(input):
+                return await run_in_threadpool(wrapper, input)
+
+        self.endpoint_calls[path] = call
+
+        # Endpoints look up their call on each request, so that a reload can swap it
+        if max_concurrency:
+            # Bound the executing and waiting requests, honoring client deadlines
+            controller = AdmissionController(max_concurrency, max_queue, timeout)
+            self.admission_controllers[path] = controller
+
+            async def endpoint(input: dict, request: Request):
+                call = self.endpoint_calls[path]
+                return await controller.run(
+                    lambda: call(input), controller.deadline_from_headers(request.headers)
+                )
+
+        else:
+
+            async def endpoint(input: dict):
+                return await self.endpoint_calls[path](input)
+        # Add a custom endpoint to the app
+        self.app.add_api_route(
+            path,
+            endpoint,
             methods=methods,
             tags=tags,
         )
 
-    ###
+    def enable_profiling_route(self, token: str = None, path: str = "/debug/profile"):
+        # Protected route to profile the next N requests and read the aggregated stats;
+        # requests must send the token in the X-Debug-Token header
+        token = token or os.environ.get(DEBUG_TOKEN_ENV)
+        if not token:
+            raise ValueError(f"A token (or the {DEBUG_TOKEN_ENV} environment variable) is required")
+
+        def check_token(request: Request):
+            if not hmac.compare_digest(request.headers.get("x-debug-token", ""), token):
+                raise HTTPException(status_code=403, detail="Invalid debug token")
+
+        @self.app.post(path, include_in_schema=False)
+        async def start_profiling(request: Request, requests: int = 10, memory: bool = False):
+            check_token(request)
+            profiler.reset()
+            profiler.arm(requests, memory)
+            return {"profiling": requests, "memory": memory}
+
+        @self.app.get(path, include_in_schema=False)
+        async def profiling_stats(request: Request, limit: int = 30, sort: str = "cumulative"):
+            check_token(request)
+            try:
+                return profiler.get_stats(limit, sort)
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=str(e))
+
+    def add_warm_up_samples(self, samples: list, path: str = None, knowledge_function: str = None):
+        # Sample inputs executed at startup through the endpoint at path, or through the
+        # endpoints of a knowledge function (by default the first one)
+        if path is not None:
+            self.warm_up_samples.setdefault(path, []).extend(samples)
+        else:
+            knowledge_function = knowledge_function or next(iter(self.knowledges))
+            self.knowledge_samples.setdefault(knowledge_function, []).extend(samples)
+
+    def get_endpoint_samples(self, path: str, test_inputs: dict = None):
+        # Test inputs of the knowledge implemented by the function of an endpoint, and the
+        # warm-up samples added for the endpoint or its function. Tests declared outside a
+        # hasKnowledge item belong to the first knowledge function.
+        if test_inputs is None:
+            test_inputs = self.get_test_inputs_by_knowledge(self.metadata_file)
+        function = self.endpoint_functions.get(path) or next(iter(self.knowledges))
+        knowledge = self.get_knowledge_id(self.knowledges[function], self.metadata_file)
+        samples = list(test_inputs.get(knowledge, [])) if knowledge is not None else []
+        if function == next(iter(self.knowledges)):
+            samples += test_inputs.get(None, [])
+        return samples + self.knowledge_samples.get(function, []) + self.warm_up_samples.get(path, [])
 
-    
\ No newline at end of file
+    async def warm_up(self):
+        # Runs the test inputs and warm-up samples of each endpoint through it
+        started = time.perf_counter()
+        report = {"endpoints": {}}
+        if self.warm_up_enabled:
+            try:
+                test_inputs = self.get_test_inputs_by_knowledge(self.metadata_file)
+            except FileNotFoundError:
+                test_inputs = {}
+            for path, call in self.endpoint_calls.items():
+                samples = self.get_endpoint_samples(path, test_inputs)
+                timings, errors = [], 0
+                for sample in samples:
+                    sample_started = time.perf_counter()
+                    try:
+                        await call(sample)
+                    except Exception:
+                        errors += 1
+                    timings.append(1000 * (time.perf_counter() - sample_started))
+                report["endpoints"][path] = {
+                    "samples": len(samples),
+                    "errors": errors,
+                    "first_ms": timings[0] if timings else None,
+                    "mean_ms": sum(timings) / len(timings) if timings else None,
+                }
+        report["total_ms"] = 1000 * (time.perf_counter() - started)
+        self.warm_up_report = report
+        self.ready = True
+        print(f"\033[32m- Warm-up completed\033[0m in {report['total_ms']:.1f} ms")
+        return report
+
+    async def reload(self):
+        """
+        Loads the current version of this KO alongside the running one and swaps it in.
+
+        The KO package is imported again in new module objects (see
+        `kgrid_sdk.reload.NewVersion`) and the new version is warmed up before its
+        endpoint calls and knowledge functions replace the current ones; if it fails, the
+        running version is left as it was. Requests already running finish with the
+        previous version. Endpoints added by the new version need a restart.
+        """
+        if self.import_path is None:
+            self.import_path = find_import_path(self)
+
+        def load():
+            with reload_lock:
+                return NewVersion(self.import_path, self.metadata_file)
+
+        new_version = await run_in_threadpool(load)
+        knowledge_object = new_version.target
+        try:
+            if not isinstance(knowledge_object, Ko_API):
+                raise TypeError(f"{self.import_path} must be a Ko_API instance or subclass")
+            knowledge_object.warm_up_enabled = self.warm_up_enabled
+            knowledge_object.warm_up_samples = self.warm_up_samples
+            knowledge_object.knowledge_samples = self.knowledge_samples
+            report = await knowledge_object.warm_up()
+            for path, result in report["endpoints"].items():
+                if result["samples"] and result["errors"] == result["samples"]:
+                    raise RuntimeError(f"All warm-up samples of {path} failed in the new version")
+        except BaseException:
+            with reload_lock:
+                new_version.discard()
+            raise
+        with reload_lock:
+            new_version.activate()
+
+        endpoint_calls = dict(self.endpoint_calls)
+        for path, call in knowledge_object.endpoint_calls.items():
+            if path in endpoint_calls:
+                endpoint_calls[path] = call
+                self.endpoint_functions[path] = knowledge_object.endpoint_functions[path]
+                if path in knowledge_object.batchers:
+                    self.batchers[path] = knowledge_object.batchers[path]
+            else:
+                print(f"\033[31mWarning:\033[0m new endpoint {path} is only served after a restart")
+        previous_version = self.version
+        self.knowledges = knowledge_object.knowledges
+        self.id = knowledge_object.id
+        self.version = knowledge_object.version
+        self.title = knowledge_object.title
+        self.description = knowledge_object.description
+        self.app.version = self.version
+        self.app.openapi_schema = None
+        self.endpoint_calls = endpoint_calls
+        print(f"\033[32m- Reloaded\033[0m {self.id}: {previous_version} -> {self.version}")
+        return report
+
+    def enable_hot_reload(self, interval: float = 1.0):
+        # Reload when the metadata or python files of the KO change, checked every `interval` seconds
+        self.hot_reload_interval = interval
+
+    async def _watch_for_changes(self):
+        module_name = (self.import_path or find_import_path(self)).partition(":")[0]
+        watcher = FileWatcher()
+        watcher.watch(self, await run_in_threadpool(source_files, module_name, self.metadata_file))
+        while True:
+            await asyncio.sleep(self.hot_reload_interval)
+            if await run_in_threadpool(watcher.poll):
+                try:
+                    await self.reload()
+                except Exception as e:
+                    print(f"\033[31mWarning:\033[0m reloading {self.id} failed: {e!r}")
+                watcher.watch(self, await run_in_threadpool(source_files, module_name, self.metadata_file))
+
+    ###
@@ -1,10 +1,38 @@
 
 import inspect
+import weakref
 from typing import Callable
 from kgrid_sdk.ko import Ko
+from kgrid_sdk.profiling import profiler
+
+# Weakly keyed, so that the functions (and modules) of a reloaded KO can be released
+_parameter_names = weakref.WeakKeyDictionary()
+
+
+def parameter_names(func: Callable):
+    # Parameter names of a knowledge function, or None if it takes *args or **kwargs.
+    # Bound methods are cached by their function, without the first parameter.
+    function = getattr(func, "__func__", func)
+    try:
+        names = _parameter_names[function]
+    except (KeyError, TypeError):
+        parameters = inspect.signature(function).parameters.values()
+        if any(p.kind in (p.VAR_POSITIONAL, p.VAR_KEYWORD) for p in parameters):
+            names = None
+        else:
+            names = tuple(p.name for p in parameters)
+        try:
+            _parameter_names[function] = names
+        except TypeError:  # not weakly referenceable
+            pass
+    if names is not None and function is not func:
+        names = names[1:]
+    return names
 
 
 class Ko_Execution(Ko):
+    __slots__ = ("knowledges",)
+
     METADATA_FILE = "metadata.json" 
     def __init__(self,  knowledges, metadata_file=METADATA_FILE):
         super().__init__(metadata_file) # , **kwargs
@@ -18,15 +46,51 @@ class Ko_Execution(Ko):
         def wrapper(input: dict):
             # Extract the required parameters from `input` dict
             kwargs = {name: input.get(name) for name in param_names}
+            if profiler.should_profile():
+                with profiler.capture():
+                    return func(**kwargs)
             return func(**kwargs)
 
         return wrapper
 
+    def create_batch_wrapper(self, func: Callable):
+        # Vectorized knowledge functions receive one list of values per parameter
+        # and return one result per input
+        signature = inspect.signature(func)
+        param_names = list(signature.parameters.keys())
+
+        def batch_wrapper(inputs: list):
+            kwargs = {name: [input.get(name) for input in inputs] for name in param_names}
+            if profiler.should_profile():
+                with profiler.capture():
+                    return func(**kwargs)
+            return func(**kwargs)
+
+        return batch_wrapper
+
+    def get_knowledge_function(self, knowledge_function: str = None):
+        return self.knowledges[knowledge_function] if knowledge_function else next(iter(self.knowledges.values()))
+
+    def get_parameter_names(self, knowledge_function: str = None):
+        return parameter_names(self.get_knowledge_function(knowledge_function))
+
+    def execute_arguments(self, arguments: dict, knowledge_function: str = None):
+        # Runs the knowledge function with arguments already extracted from the input,
+        # e.g. by a KnowledgeBase field plan
+        func = self.get_knowledge_function(knowledge_function)
+        if profiler.should_profile():
+            with profiler.capture():
+                return func(**arguments)
+        return func(**arguments)
+
     def execute(
-        self, input: dict, knowledge_function: str = None
+        self, input: dict, knowledge_function: str = None, profile: bool = False
     ):  # if multiple knowledge functions, mention the function name
         wrapper = self.create_wrapper(self.knowledges[knowledge_function] if knowledge_function else next(iter(self.knowledges.values())))
         
+        if profile:  # otherwise the wrapper profiles when KGRID_PROFILE or the API selects the call
+            with profiler.capture():
+                return wrapper(input)
         return wrapper(input)
         # fn = self.knowledges[knowledge_function] if knowledge_function else next(iter(self.knowledges.values()))
         # return fn(**input) #possible solution without wrapper
\ No newline at end of file
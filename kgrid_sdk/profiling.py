@@ -0,0 +1,135 @@
+import cProfile
+import io
+import os
+import pstats
+import random
+import threading
+import tracemalloc
+from contextlib import contextmanager
+
+PROFILE_ENV = "KGRID_PROFILE"  # "1" profiles every call, a fraction such as "0.01" samples calls
+PROFILE_MEMORY_ENV = "KGRID_PROFILE_MEMORY"  # "1" also traces memory allocations
+# Sort orders of get_stats: the pstats.SortKey values and their long names, e.g. "tottime"
+SORT_KEYS = frozenset(key.value for key in pstats.SortKey) | frozenset(pstats.Stats.sort_arg_dict_default)
+
+
+class Profiler:
+    """
+    Opt-in profiling of knowledge function executions.
+
+    A call is profiled when it is requested explicitly, when the KGRID_PROFILE
+    environment variable selects it, or while the profiler is armed for the next N
+    calls. Captures are aggregated with cProfile (and tracemalloc when memory
+    profiling is on). Only one capture runs at a time; calls made while another
+    capture is running are not profiled, so nested executions are counted once, and
+    only calls actually captured count towards the N armed calls.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._capture_lock = threading.Lock()
+        self.remaining = 0
+        self.memory = False
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.stats = None
+            self.captures = 0
+            self.memory_peak = 0
+            self.allocations: dict[str, int] = {}
+
+    def arm(self, calls: int, memory: bool = False):
+        # Profile the next `calls` executions
+        with self._lock:
+            self.remaining = calls
+            self.memory = memory
+
+    def should_profile(self, profile: bool = None):
+        if profile is not None:
+            return profile
+        if self._capture_lock.locked():  # nested in a running capture
+            return False
+        if self.remaining:  # counted down by the capture, once it runs
+            return True
+        setting = os.environ.get(PROFILE_ENV)
+        if not setting or setting.lower() in ("0", "false"):
+            return False
+        if setting.lower() in ("1", "true"):
+            return True
+        try:
+            return random.random() < float(setting)
+        except ValueError:
+            return False
+
+    @contextmanager
+    def capture(self, memory: bool = None):
+        if memory is None:
+            memory = self.memory or os.environ.get(PROFILE_MEMORY_ENV, "").lower() in ("1", "true")
+        if not self._capture_lock.acquire(blocking=False):
+            yield
+            return
+        with self._lock:
+            if self.remaining:
+                self.remaining -= 1
+        profile = cProfile.Profile()
+        started_tracing = memory and not tracemalloc.is_tracing()
+        try:
+            if started_tracing:
+                tracemalloc.start()
+            if memory:
+                tracemalloc.reset_peak()
+                before = tracemalloc.take_snapshot()
+            try:
+                profile.enable()
+            except ValueError:  # another profiling tool is active
+                profile = None
+            try:
+                yield
+            finally:
+                if profile is not None:
+                    profile.disable()
+                self._collect(profile, before if memory else None)
+        finally:
+            if started_tracing:
+                tracemalloc.stop()
+            self._capture_lock.release()
+
+    def _collect(self, profile, snapshot_before):
+        with self._lock:
+            self.captures += 1
+            if profile is not None:
+                if self.stats is None:
+                    self.stats = pstats.Stats(profile)
+                else:
+                    self.stats.add(profile)
+            if snapshot_before is not None:
+                self.memory_peak = max(self.memory_peak, tracemalloc.get_traced_memory()[1])
+                for difference in tracemalloc.take_snapshot().compare_to(snapshot_before, "lineno"):
+                    if difference.size_diff > 0:
+                        location = str(difference.traceback)
+                        self.allocations[location] = self.allocations.get(location, 0) + difference.size_diff
+
+    def get_stats(self, limit: int = 30, sort: str = "cumulative"):
+        if sort not in SORT_KEYS:
+            raise ValueError(f"Unknown sort key {sort!r}, expected one of {', '.join(sorted(SORT_KEYS))}")
+        with self._lock:
+            text = ""
+            if self.stats is not None:
+                output = io.StringIO()
+                self.stats.stream = output
+                self.stats.sort_stats(sort).print_stats(limit)
+                text = output.getvalue()
+            return {
+                "captures": self.captures,
+                "remaining": self.remaining,
+                "stats": text,
+                "memory_peak_bytes": self.memory_peak,
+                "top_allocations": [
+                    {"location": location, "bytes": size}
+                    for location, size in sorted(self.allocations.items(), key=lambda item: -item[1])[:limit]
+                ],
+            }
+
+
+profiler = Profiler()  # process-wide profiler used by Ko_Execution, KnowledgeBase and Ko_API
@@ -0,0 +1,54 @@
+class FieldPlan:
+    """
+    Input fields read by the knowledge objects of a knowledgebase, compiled once.
+
+    `parameters_by_name` maps each KO to the parameter names of its knowledge
+    function, or to None when they are not known (a lazily registered KO that is not
+    loaded yet, or a function taking **kwargs); those KOs receive the full input.
+    The union of all fields is extracted from a patient record in a single pass and
+    each KO gets its arguments from that tuple by position.
+    """
+
+    __slots__ = ("fields", "parameters", "positions", "full_input")
+
+    def __init__(self, parameters_by_name: dict):
+        fields = {}
+        for parameters in parameters_by_name.values():
+            for field in parameters or ():
+                fields.setdefault(field, len(fields))
+        self.fields = tuple(fields)
+        self.parameters = {
+            name: parameters for name, parameters in parameters_by_name.items() if parameters is not None
+        }
+        self.positions = {
+            name: tuple(fields[field] for field in parameters) for name, parameters in self.parameters.items()
+        }
+        self.full_input = frozenset(
+            name for name, parameters in parameters_by_name.items() if parameters is None
+        )
+
+    def extract(self, patient_data: dict):
+        # Missing fields are None, as when each KO reads the record itself
+        return tuple(map(patient_data.get, self.fields))
+
+    def arguments(self, name, values: tuple):
+        return dict(zip(self.parameters[name], map(values.__getitem__, self.positions[name])))
+
+    def missing_fields(self, available_fields, names=None):
+        # {KO: fields it reads that are not available}, for the given KOs or all of them;
+        # KOs receiving the full input are not checked
+        if not isinstance(available_fields, (dict, set, frozenset)):
+            available_fields = set(available_fields)
+        missing = {}
+        for name in self.parameters if names is None else names:
+            fields = [field for field in self.parameters.get(name, ()) if field not in available_fields]
+            if fields:
+                missing[name] = fields
+        return missing
+
+    def extra_fields(self, available_fields):
+        # Fields no KO reads; unknown while some KO receives the full input
+        if self.full_input:
+            return []
+        fields = set(self.fields)
+        return sorted(field for field in available_fields if field not in fields)
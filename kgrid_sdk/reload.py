@@ -0,0 +1,227 @@
+import importlib
+import importlib.util
+import os
+import sys
+import threading
+from pathlib import Path
+
+from kgrid_sdk.ko import Ko, invalidate_caches, restore_caches
+
+reload_lock = threading.Lock()  # module reloads are process-wide, one at a time
+
+
+def find_package_root(module_name: str):
+    # Folder of the top-level package of a module (or the module file), without importing it
+    package = module_name.split(".")[0]
+    if package == "__main__":
+        return None
+    spec = importlib.util.find_spec(package)
+    if spec is None:
+        return None
+    if spec.submodule_search_locations:
+        return Path(next(iter(spec.submodule_search_locations))).resolve()
+    return Path(spec.origin).resolve() if spec.origin else None
+
+
+def find_import_path(knowledge_object: Ko):
+    # "module:attribute" of a KO instance: the module-level variable holding it, or its class
+    cls = type(knowledge_object)
+    for module_name in (cls.__module__.split(".")[0], cls.__module__):
+        module = sys.modules.get(module_name)
+        for attribute, value in vars(module).items() if module else ():
+            if value is knowledge_object:
+                return f"{module_name}:{attribute}"
+    return f"{cls.__module__}:{cls.__qualname__}"
+
+
+def find_ko_directory(module_name: str, metadata_file: str = Ko.METADATA_FILE):
+    # Folder of the KO metadata (in the package folder or next to it), as in Ko.get_metadata_path
+    root = find_package_root(module_name)
+    if root is None:
+        return None
+    folder = root if root.is_dir() else root.parent
+    if not (folder / metadata_file).exists() and (folder.parent / metadata_file).exists():
+        return folder.parent
+    return folder
+
+
+def source_files(module_name: str, metadata_file: str = Ko.METADATA_FILE):
+    """The python files of the package of a module and its metadata file, as watched for changes."""
+    root = find_package_root(module_name)
+    if root is None:
+        return []
+    if root.is_file():
+        files = [root]
+    else:
+        files = [
+            Path(folder) / name
+            for folder, folders, names in os.walk(root)
+            for name in names
+            if name.endswith(".py") and "__pycache__" not in folder
+        ]
+    metadata_path = find_ko_directory(module_name, metadata_file) / metadata_file
+    if metadata_path.exists():
+        files.append(metadata_path)
+    return sorted(files)
+
+
+class NewVersion:
+    """
+    The current version of a KO imported in fresh module objects, next to the running one.
+
+    The modules of the KO package are imported again from their files while the running
+    modules are set aside, and the running modules are put back in sys.modules right
+    after, so the running version keeps its own module globals. Its cached metadata and
+    resources are dropped. `activate` switches sys.modules to the new modules, e.g. once
+    the new version is warmed up, and `discard` puts back the cached metadata and
+    resources of the running version. Imports of the package by other threads while the
+    new version is imported see the new modules.
+    """
+
+    __slots__ = ("import_path", "directory", "target", "modules", "_caches")
+
+    def __init__(self, import_path: str, metadata_file: str = Ko.METADATA_FILE):
+        module_name, _, attribute = import_path.partition(":")
+        package = module_name.split(".")[0]
+        if package == "__main__":
+            raise ValueError(f"{import_path} is defined in the main script and cannot be reloaded")
+        self.import_path = import_path
+        self.directory = find_ko_directory(module_name, metadata_file)
+        self._caches = invalidate_caches(self.directory) if self.directory is not None else None
+        running = _pop_modules(package)
+        importlib.invalidate_caches()
+        try:
+            target = getattr(importlib.import_module(module_name), attribute)
+            if isinstance(target, type):
+                target = target()
+            if not isinstance(target, Ko):
+                raise TypeError(f"{import_path} must be a Ko instance or subclass")
+        except BaseException:
+            _pop_modules(package)
+            sys.modules.update(running)
+            self.discard()
+            raise
+        self.modules = _pop_modules(package)
+        sys.modules.update(running)
+        self.target = target
+
+    def activate(self):
+        # Later imports of the package get the modules of the new version
+        package = self.import_path.partition(":")[0].split(".")[0]
+        _pop_modules(package)
+        sys.modules.update(self.modules)
+
+    def discard(self):
+        # The running version gets back the metadata and resources cached before the reload
+        if self._caches is not None:
+            invalidate_caches(self.directory)
+            restore_caches(self._caches)
+
+
+def _pop_modules(package: str):
+    # Removes the modules of a package from sys.modules and returns them
+    modules = {
+        name: module
+        for name, module in list(sys.modules.items())
+        if name == package or name.startswith(package + ".")
+    }
+    for name in modules:
+        sys.modules.pop(name, None)
+    return modules
+
+
+def warm_up(knowledge_object: Ko):
+    """
+    Runs the test inputs declared in the metadata of a KO and returns (samples, errors).
+
+    The tests of a hasKnowledge item run through the knowledge function implemented by
+    it, the others through the default one. Returns None when the KO declares no test
+    inputs, so that the KO cannot be validated.
+    """
+    if not isinstance(knowledge_object, Ko):
+        return None
+    try:
+        test_inputs = knowledge_object.get_test_inputs_by_knowledge(knowledge_object.metadata_file)
+    except FileNotFoundError:
+        return None
+    functions = {}
+    for name, function in getattr(knowledge_object, "knowledges", {}).items():
+        functions.setdefault(knowledge_object.get_knowledge_id(function, knowledge_object.metadata_file), name)
+    samples = errors = 0
+    for knowledge, inputs in test_inputs.items():
+        function = functions.get(knowledge)
+        for input in inputs:
+            samples += 1
+            try:
+                if function is None:
+                    knowledge_object.execute(input)
+                else:
+                    knowledge_object.execute(input, function)
+            except Exception:
+                errors += 1
+    return (samples, errors) if samples else None
+
+
+class FileWatcher:
+    """
+    Polls the modification times of groups of files and reports the groups with a
+    changed or removed file, either from `poll` or by calling `on_change(key)` in a
+    background thread. Files created after a group is watched are not noticed until
+    the group is watched again.
+    """
+
+    def __init__(self, on_change=None, interval: float = 1.0):
+        self.on_change = on_change
+        self.interval = interval
+        self.groups: dict[object, dict[Path, int]] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def watch(self, key, paths):
+        snapshot = {Path(path): _mtime(path) for path in paths}
+        with self._lock:
+            self.groups[key] = snapshot
+
+    def unwatch(self, key):
+        with self._lock:
+            self.groups.pop(key, None)
+
+    def poll(self):
+        # Changed groups are reported once, until their files change again
+        with self._lock:
+            groups = list(self.groups.items())
+        changed = []
+        for key, snapshot in groups:
+            if any(_mtime(path) != mtime for path, mtime in snapshot.items()):
+                changed.append(key)
+                self.watch(key, snapshot)
+        return changed
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            for key in self.poll():
+                try:
+                    self.on_change(key)
+                except Exception as e:
+                    print(f"\033[31mWarning:\033[0m reloading {key} failed: {e!r}")
+
+    def start(self):
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="kgrid-file-watcher", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+
+def _mtime(path):
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
@@ -0,0 +1,267 @@
+import gc
+import importlib
+import os
+import signal
+import socket
+import sys
+import time
+
+try:
+    import uvicorn
+except ImportError:
+    print("API functionality not installed. Install with `-E api`.")
+
+from kgrid_sdk.ko import Ko
+
+
+def load_app(target: str):
+    """Import `module:attribute` and return the ASGI app it refers to (a Ko_API instance or class, or an app)."""
+    module_name, _, attribute = target.partition(":")
+    if not module_name or not attribute:
+        raise ValueError(f"Target '{target}' must have the form 'module:attribute'")
+    module = sys.modules.get(module_name) or importlib.import_module(module_name)
+    obj = getattr(module, attribute)
+    if isinstance(obj, type) and issubclass(obj, Ko):
+        obj = obj()
+    return obj.app if isinstance(obj, Ko) else obj
+
+
+def worker_memory(pid: int):
+    # Resident, proportional and shared memory of a process in KiB (Linux only)
+    memory = {}
+    try:
+        with open(f"/proc/{pid}/smaps_rollup", "r") as file:
+            for line in file:
+                key, _, value = line.partition(":")
+                if key in ("Rss", "Pss", "Shared_Clean", "Shared_Dirty", "Private_Clean", "Private_Dirty"):
+                    memory[key] = int(value.split()[0])
+    except OSError:
+        return None
+    return {
+        "rss_kb": memory.get("Rss"),
+        "pss_kb": memory.get("Pss"),
+        "shared_kb": memory.get("Shared_Clean", 0) + memory.get("Shared_Dirty", 0),
+        "private_kb": memory.get("Private_Clean", 0) + memory.get("Private_Dirty", 0),
+    }
+
+
+def _bind_socket(host: str, port: int, reuse_port: bool, listen: bool = True):
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    try:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        if reuse_port:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+        sock.bind((host, port))
+        if listen:
+            sock.listen(2048)
+    except OSError as e:
+        sock.close()
+        raise OSError(e.errno, f"Cannot bind {host}:{port}: {e.strerror}") from e
+    sock.set_inheritable(True)
+    return sock
+
+
+class MultiWorkerServer:
+    """
+    Pre-forking server for Ko_API apps.
+
+    The app, the KO and any data it loads at import time are loaded once in the master
+    process, the heap is frozen with `gc.freeze()` so that garbage collection does not
+    touch (and copy) the shared pages, and the workers are forked from the master.
+    Workers share one listening socket, or each bind their own with SO_REUSEPORT.
+
+    Signals sent to the master: SIGTERM/SIGINT stop all workers gracefully, SIGHUP
+    re-imports the target and replaces the workers one at a time, and SIGUSR1 prints
+    the memory of each worker.
+
+    Workers that exit are restarted. A worker exiting within `startup_period` seconds
+    counts as a failed start: restarts are delayed exponentially (up to 30 s) and after
+    `max_startup_failures` failed starts in a row the server stops.
+    """
+
+    def __init__(
+        self,
+        target: str,
+        host: str = "127.0.0.1",
+        port: int = 8000,
+        workers: int = None,
+        reuse_port: bool = False,
+        stats_interval: float = 0,
+        log_level: str = "info",
+        graceful_timeout: float = 30,
+        startup_period: float = 10,
+        max_startup_failures: int = 5,
+    ):
+        self.target = target
+        self.host = host
+        self.port = port
+        self.workers = workers or os.cpu_count() or 1
+        self.reuse_port = reuse_port
+        self.stats_interval = stats_interval
+        self.log_level = log_level
+        self.graceful_timeout = graceful_timeout
+        self.startup_period = startup_period
+        self.max_startup_failures = max_startup_failures
+        self.app = None
+        self.socket = None
+        self.worker_pids: set[int] = set()
+        self._started: dict[int, float] = {}  # pid -> start time of the worker
+        self._startup_failures = 0  # failed starts in a row
+        self._restarts = 0  # workers waiting to be restarted
+        self._restart_at = 0.0
+        self._signals = []
+
+    def preload(self, reload: bool = False):
+        if reload:
+            gc.unfreeze()
+            module = sys.modules.get(self.target.partition(":")[0])
+            if module is not None:
+                importlib.reload(module)
+        self.app = load_app(self.target)
+        # Move everything loaded so far to the permanent generation before forking
+        gc.collect()
+        gc.freeze()
+
+    def run(self):
+        self.preload()
+        if self.reuse_port:
+            # Fail before forking if the port cannot be bound, the workers bind their own
+            _bind_socket(self.host, self.port, reuse_port=True, listen=False).close()
+        else:
+            self.socket = _bind_socket(self.host, self.port, reuse_port=False)
+        for signum in (signal.SIGTERM, signal.SIGINT, signal.SIGHUP, signal.SIGUSR1):
+            signal.signal(signum, lambda signum, frame: self._signals.append(signum))
+        print(
+            f"\033[32m- Serving\033[0m {self.target} on http://{self.host}:{self.port} "
+            f"with {self.workers} workers (master pid {os.getpid()})"
+        )
+        for _ in range(self.workers):
+            self.spawn_worker()
+
+        last_stats = time.monotonic()
+        try:
+            while True:
+                while self._signals:
+                    signum = self._signals.pop(0)
+                    if signum in (signal.SIGTERM, signal.SIGINT):
+                        return
+                    if signum == signal.SIGHUP:
+                        self.reload()
+                    elif signum == signal.SIGUSR1:
+                        self.report_memory()
+                self.reap_workers(respawn=True)
+                if self._restarts and time.monotonic() >= self._restart_at:
+                    while self._restarts:
+                        self._restarts -= 1
+                        self.spawn_worker()
+                if self.stats_interval and time.monotonic() - last_stats >= self.stats_interval:
+                    self.report_memory()
+                    last_stats = time.monotonic()
+                time.sleep(0.2)
+        finally:
+            self.stop_workers(list(self.worker_pids))
+            if self.socket:
+                self.socket.close()
+
+    def spawn_worker(self):
+        pid = os.fork()
+        if pid:
+            self.worker_pids.add(pid)
+            self._started[pid] = time.monotonic()
+            return pid
+        # Worker process: restore default signal handling, uvicorn installs its own
+        for signum in (signal.SIGTERM, signal.SIGINT, signal.SIGHUP, signal.SIGUSR1):
+            signal.signal(signum, signal.SIG_DFL)
+        sock = self.socket or _bind_socket(self.host, self.port, reuse_port=True)
+        config = uvicorn.Config(
+            self.app,
+            log_level=self.log_level,
+            timeout_graceful_shutdown=self.graceful_timeout,
+        )
+        exit_code = 0
+        try:
+            uvicorn.Server(config).run(sockets=[sock])
+        except BaseException:
+            exit_code = 1
+        finally:
+            os._exit(exit_code)
+
+    def reap_workers(self, respawn: bool):
+        now = time.monotonic()
+        if any(now - started >= self.startup_period for started in self._started.values()):
+            self._startup_failures = 0  # a worker has started successfully
+        for pid in list(self.worker_pids):
+            try:
+                finished, status = os.waitpid(pid, os.WNOHANG)
+            except ChildProcessError:
+                finished, status = pid, 0
+            if finished:
+                self.worker_pids.discard(pid)
+                uptime = time.monotonic() - self._started.pop(pid, 0)
+                if not respawn:
+                    continue
+                if uptime < self.startup_period:
+                    self._startup_failures += 1
+                    if self._startup_failures >= self.max_startup_failures:
+                        raise RuntimeError(
+                            f"Workers exited within {self.startup_period} s of starting "
+                            f"{self._startup_failures} times in a row, stopping"
+                        )
+                    delay = min(30, 0.5 * 2 ** (self._startup_failures - 1))
+                else:
+                    self._startup_failures = 0
+                    delay = 0
+                print(
+                    f"\033[31mWarning:\033[0m worker {pid} exited ({status}) after {uptime:.1f} s, "
+                    f"restarting in {delay:.1f} s"
+                )
+                self._restarts += 1
+                self._restart_at = max(self._restart_at, time.monotonic() + delay)
+
+    def stop_workers(self, pids):
+        for pid in pids:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+        deadline = time.monotonic() + self.graceful_timeout
+        for pid in pids:
+            while time.monotonic() < deadline:
+                try:
+                    finished, _ = os.waitpid(pid, os.WNOHANG)
+                except ChildProcessError:
+                    break
+                if finished:
+                    break
+                time.sleep(0.05)
+            else:
+                try:
+                    os.kill(pid, signal.SIGKILL)
+                    os.waitpid(pid, 0)
+                except (ProcessLookupError, ChildProcessError):
+                    pass
+            self.worker_pids.discard(pid)
+            self._started.pop(pid, None)
+
+    def reload(self):
+        # Load the new code in the master, then replace the workers one at a time so
+        # that the socket keeps being served during the reload
+        print(f"\033[32m- Reloading\033[0m {self.target}")
+        try:
+            self.preload(reload=True)
+        except Exception as e:
+            print(f"\033[31mWarning:\033[0m reload failed, keeping current workers: {e}")
+            return
+        for old_pid in list(self.worker_pids):
+            self.spawn_worker()
+            self.stop_workers([old_pid])
+
+    def report_memory(self):
+        for pid in sorted(self.worker_pids):
+            memory = worker_memory(pid)
+            if memory:
+                print(
+                    f"- worker {pid}: rss {memory['rss_kb']} KiB, pss {memory['pss_kb']} KiB, "
+                    f"shared {memory['shared_kb']} KiB, private {memory['private_kb']} KiB"
+                )
@@ -0,0 +1,268 @@
+import abc
+import hashlib
+import importlib
+import itertools
+import json
+import os
+from concurrent.futures import ALL_COMPLETED, FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from pathlib import Path
+
+MANIFEST_FILE = "manifest.json"
+
+
+class Transport(abc.ABC):
+    """
+    Executes partitions. `submit` runs a picklable function with its arguments on some
+    worker and returns a concurrent.futures.Future; implementations may use local
+    processes or remote nodes.
+    """
+
+    @abc.abstractmethod
+    def submit(self, function, *args) -> Future:
+        pass
+
+    def shutdown(self):
+        pass
+
+
+class LocalProcessTransport(Transport):
+    def __init__(self, workers: int = None):
+        self.workers = workers or os.cpu_count() or 1
+        self.executor = ProcessPoolExecutor(max_workers=self.workers)
+
+    def submit(self, function, *args) -> Future:
+        return self.executor.submit(function, *args)
+
+    def shutdown(self):
+        self.executor.shutdown()
+
+
+_knowledgebases = {}  # import path -> knowledgebase, loaded once per worker process
+
+
+def load_knowledgebase(import_path: str):
+    knowledgebase = _knowledgebases.get(import_path)
+    if knowledgebase is None:
+        module_name, _, attribute = import_path.partition(":")
+        knowledgebase = getattr(importlib.import_module(module_name), attribute)
+        _knowledgebases[import_path] = knowledgebase
+    return knowledgebase
+
+
+def _atomic_write_json(path: Path, data):
+    tmp_path = path.with_name(f".{path.name}.tmp-{os.getpid()}")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=4)
+    os.replace(tmp_path, path)
+
+
+def dataset_fingerprint(dataset, first_record):
+    # Identifies the dataset of a run (path and size of a file, length of a sequence, and a
+    # hash of the first record), so that resuming over another dataset fails
+    fingerprint = {
+        "first_record": hashlib.sha256(
+            json.dumps(first_record, sort_keys=True, default=str).encode()
+        ).hexdigest()
+    }
+    if isinstance(dataset, (str, Path)):
+        fingerprint["path"] = str(Path(dataset).resolve())
+        fingerprint["size"] = os.path.getsize(dataset)
+    elif hasattr(dataset, "__len__"):
+        fingerprint["records"] = len(dataset)
+    return fingerprint
+
+
+def unify_partition_schemas(paths):
+    # Casts Parquet partitions written with inferred types to the unified schema of all
+    # of them; partitions that already have it are left as they are
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    from kgrid_sdk.columnar import cast_to_schema
+
+    schemas = [pq.read_schema(path) for path in paths]
+    if not schemas:
+        return None
+    schema = pa.unify_schemas(schemas, promote_options="permissive")
+    for path, partition_schema in zip(paths, schemas):
+        if not partition_schema.equals(schema):
+            path = Path(path)
+            tmp_path = path.with_name(f".{path.name}.tmp-{os.getpid()}")
+            try:
+                pq.write_table(cast_to_schema(pq.read_table(path), schema), tmp_path)
+                os.replace(tmp_path, path)
+            except BaseException:
+                tmp_path.unlink(missing_ok=True)
+                raise
+    return schema
+
+
+def run_partition(knowledgebase_path, output_dir, partition_id, start, records, format, id_field, schema=None):
+    # Writes the results of one partition to a temporary file and renames it into place,
+    # so a partition file either holds all results of the partition or does not exist
+    knowledgebase = load_knowledgebase(knowledgebase_path)
+    output_dir = Path(output_dir)
+    file_name = f"{partition_id}.{'parquet' if format == 'parquet' else 'jsonl'}"
+    tmp_path = output_dir / f".{file_name}.tmp-{os.getpid()}"
+    row_ids = [record.get(id_field) if id_field else start + i for i, record in enumerate(records)]
+    try:
+        if format == "parquet":
+            from kgrid_sdk.columnar import ColumnarResultWriter
+
+            with ColumnarResultWriter(tmp_path, "parquet", schema=schema) as writer:
+                for row_id, record in zip(row_ids, records):
+                    writer.append(row_id, knowledgebase.calculate_for_all(record))
+        else:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                for row_id, record in zip(row_ids, records):
+                    f.write(json.dumps({"row_id": row_id, "results": knowledgebase.calculate_for_all(record)}) + "\n")
+        os.replace(tmp_path, output_dir / file_name)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+    return {"file": file_name, "start": start, "rows": len(records)}
+
+
+def _read_jsonl(path):
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+class ShardedRunner:
+    """
+    Runs a knowledgebase over a dataset split into partitions, with checkpointing.
+
+    The knowledgebase is given by import path ("module:attribute") so that each worker
+    loads it once. The dataset is a sequence or iterable of patient records, or the path
+    of a JSON Lines file. Each partition's results are written atomically to
+    `output_dir`, and completed partitions are recorded in a manifest; running again
+    with the same dataset and partition size skips the completed partitions.
+
+    Parquet partitions are written with `schema` if given. Otherwise each partition
+    infers its types, and at the end of the run the partitions are cast to the unified
+    schema of all of them, so that every partition has the same schema.
+    """
+
+    def __init__(
+        self,
+        knowledgebase: str,
+        output_dir,
+        partition_size: int = 10000,
+        transport: Transport = None,
+        workers: int = None,
+        format: str = "jsonl",
+        id_field: str = None,
+        schema=None,
+    ):
+        if format not in ("jsonl", "parquet"):
+            raise ValueError(f"Unknown format {format}, use jsonl or parquet")
+        self.knowledgebase = knowledgebase
+        self.output_dir = Path(output_dir)
+        self.partition_size = partition_size
+        self.transport = transport
+        self.workers = workers
+        self.format = format
+        self.id_field = id_field
+        self.schema = schema
+
+    @property
+    def manifest_path(self):
+        return self.output_dir / MANIFEST_FILE
+
+    def load_manifest(self, dataset: dict = None):
+        # The manifest of a previous run, if it ran with the same settings and dataset
+        # (see dataset_fingerprint), or a new one
+        settings = {
+            "knowledgebase": self.knowledgebase,
+            "partition_size": self.partition_size,
+            "format": self.format,
+            "dataset": dataset,
+        }
+        if self.manifest_path.exists():
+            with open(self.manifest_path, "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+            for key, value in settings.items():
+                if value is not None and manifest.get(key, value) != value:
+                    raise ValueError(
+                        f"{self.manifest_path} was written with {key.replace('_', ' ')} "
+                        f"{manifest.get(key)}, not {value}; use another output folder"
+                    )
+                manifest.setdefault(key, value)
+            return manifest
+        return {**settings, "partitions": {}}
+
+    def partitions(self, dataset):
+        # (partition id, start index, records), read lazily from the dataset
+        iterator = _read_jsonl(dataset) if isinstance(dataset, (str, Path)) else iter(dataset)
+        for number in itertools.count():
+            records = list(itertools.islice(iterator, self.partition_size))
+            if not records:
+                return
+            yield f"part-{number:05d}", number * self.partition_size, records
+
+    def is_completed(self, manifest, partition_id):
+        partition = manifest["partitions"].get(partition_id)
+        return partition is not None and (self.output_dir / partition["file"]).exists()
+
+    def run(self, dataset):
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        iterator = _read_jsonl(dataset) if isinstance(dataset, (str, Path)) else iter(dataset)
+        first_record = next(iterator, None)
+        if first_record is not None:
+            iterator = itertools.chain([first_record], iterator)
+        manifest = self.load_manifest(dataset_fingerprint(dataset, first_record))
+        transport = self.transport or LocalProcessTransport(self.workers)
+        # Bound the partitions in flight so the dataset is not loaded all at once
+        max_pending = 2 * (getattr(transport, "workers", None) or os.cpu_count() or 1)
+        pending, failed, skipped = {}, {}, 0
+
+        def collect(return_when):
+            done, _ = wait(pending, return_when=return_when)
+            for future in done:
+                partition_id = pending.pop(future)
+                try:
+                    manifest["partitions"][partition_id] = future.result()
+                except Exception as e:
+                    failed[partition_id] = repr(e)
+                    continue
+                _atomic_write_json(self.manifest_path, manifest)
+
+        try:
+            for partition_id, start, records in self.partitions(iterator):
+                if self.is_completed(manifest, partition_id):
+                    skipped += 1
+                    continue
+                if len(pending) >= max_pending:
+                    collect(FIRST_COMPLETED)
+                future = transport.submit(
+                    run_partition,
+                    self.knowledgebase,
+                    str(self.output_dir),
+                    partition_id,
+                    start,
+                    records,
+                    self.format,
+                    self.id_field,
+                    self.schema,
+                )
+                pending[future] = partition_id
+            if pending:
+                collect(ALL_COMPLETED)
+        finally:
+            if self.transport is None:
+                transport.shutdown()
+        if self.format == "parquet" and not failed:
+            unify_partition_schemas(
+                [self.output_dir / partition["file"] for _, partition in sorted(manifest["partitions"].items())]
+            )
+        _atomic_write_json(self.manifest_path, manifest)
+
+        print(
+            f"\033[32m- Partitions completed\033[0m: {len(manifest['partitions'])}, "
+            f"skipped as already completed: {skipped}"
+        )
+        if failed:
+            raise RuntimeError(f"Partitions failed: {failed}")
+        return manifest
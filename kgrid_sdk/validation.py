@@ -0,0 +1,231 @@
+import functools
+import hashlib
+import json
+import os
+from pathlib import Path
+from urllib.parse import unquote, urlparse
+
+import requests
+from pyld import jsonld
+
+KOIO = "https://kgrid.org/koio#"
+DC = "http://purl.org/dc/elements/1.1/"
+IMPLEMENTED_BY = "http://www.ebi.ac.uk/swo/SWO_0000085"
+HAS_INTERFACE = "http://www.ebi.ac.uk/swo/SWO_0004001"
+DEPENDS_ON = "http://purl.obolibrary.org/obo/RO_0002502"
+
+# KOIO properties and the kind of value they take: "node" (an object), "literal" or "any"
+KOIO_PROPERTIES = {
+    "KOIOVersion": "literal",
+    "hasKnowledge": "node",
+    "hasKnowledgeObject": "node",
+    "hasService": "node",
+    "hasTest": "node",
+    "hasDocumentation": "node",
+    "hasResource": "node",
+    "applicability": "any",
+}
+# Properties of other vocabularies that the SDK relies on
+EXTERNAL_PROPERTIES = {
+    DC + "title": "literal",
+    DC + "version": "literal",
+    DC + "description": "literal",
+    DC + "license": "node",
+    IMPLEMENTED_BY: "node",
+    HAS_INTERFACE: "node",
+    DEPENDS_ON: "any",
+}
+SHORT_NAMES = {IMPLEMENTED_BY: "implementedBy", HAS_INTERFACE: "hasInterface", DEPENDS_ON: "dependsOn"}
+# Properties required on the items of a KOIO property; a tuple lists alternatives, e.g.
+# the knowledge of a knowledgebase (a KnowledgeSet) lists KOs instead of an implementation
+REQUIRED_PROPERTIES = {
+    "hasKnowledge": [(IMPLEMENTED_BY, KOIO + "hasKnowledgeObject")],
+    "hasService": [IMPLEMENTED_BY],
+    "hasTest": [IMPLEMENTED_BY],
+}
+# Properties whose @id values are files or folders next to the metadata
+FILE_PROPERTIES = [IMPLEMENTED_BY, KOIO + "hasDocumentation", KOIO + "hasResource", DC + "license"]
+# Compact keys read directly by the SDK and the CLI
+REQUIRED_KEYS = ["@context", "@id", "@type", "dc:title", "dc:version"]
+
+
+@functools.lru_cache(maxsize=None)
+def compile_schema():
+    # Property rules keyed by expanded IRI, built once per process
+    kinds = {KOIO + name: kind for name, kind in KOIO_PROPERTIES.items()}
+    kinds.update(EXTERNAL_PROPERTIES)
+    required = {KOIO + name: properties for name, properties in REQUIRED_PROPERTIES.items()}
+    return kinds, required, frozenset(FILE_PROPERTIES)
+
+
+def default_context_cache():
+    return Path(os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache")) / "kgrid" / "contexts"
+
+
+@functools.lru_cache(maxsize=None)
+def load_context(url: str, cache_dir: str = None, offline: bool = False):
+    """Returns a remote JSON-LD context, fetched once per process and optionally cached on disk."""
+    cache_file = None
+    if cache_dir:
+        cache_file = Path(cache_dir) / (hashlib.sha256(url.encode()).hexdigest() + ".json")
+        if cache_file.exists():
+            with open(cache_file, "r", encoding="utf-8") as f:
+                return json.load(f)
+    if offline:
+        raise ValueError(f"context {url} is not in the context cache and --offline is set")
+    response = requests.get(url, headers={"Accept": "application/ld+json, application/json"}, timeout=30)
+    response.raise_for_status()
+    document = response.json()
+    if cache_file:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = cache_file.with_name(f".{cache_file.name}.tmp-{os.getpid()}")
+        with open(tmp_file, "w", encoding="utf-8") as f:
+            json.dump(document, f)
+        os.replace(tmp_file, cache_file)
+    return document
+
+
+def create_document_loader(cache_dir: str = None, offline: bool = False):
+    def loader(url, options=None):
+        if url.startswith("file:"):
+            with open(unquote(urlparse(url).path), "r", encoding="utf-8") as f:
+                document = json.load(f)
+        else:
+            try:
+                document = load_context(url, cache_dir, offline)
+            except Exception as e:
+                raise jsonld.JsonLdError(
+                    f"Could not load context {url}: {e}", "jsonld.LoadDocumentError", code="loading document failed"
+                )
+        return {"contextUrl": None, "documentUrl": url, "document": document}
+
+    return loader
+
+
+_directory_listings = {}  # directory -> set of entry names, listed once per process
+
+
+def list_directory(directory: str):
+    entries = _directory_listings.get(directory)
+    if entries is None:
+        try:
+            with os.scandir(directory) as iterator:
+                entries = frozenset(entry.name for entry in iterator)
+        except OSError:
+            entries = frozenset()
+        _directory_listings[directory] = entries
+    return entries
+
+
+def find_missing_paths(paths):
+    # One directory listing per unique parent directory instead of one stat per path
+    missing = []
+    for path in sorted(set(paths)):
+        directory, name = os.path.split(path)
+        if name and name not in list_directory(directory):
+            missing.append(path)
+    return missing
+
+
+def short_name(iri: str):
+    if iri.startswith(KOIO):
+        return iri[len(KOIO) :]
+    if iri.startswith(DC):
+        return "dc:" + iri[len(DC) :]
+    return SHORT_NAMES.get(iri, iri)
+
+
+def check_node(node, kinds, required, file_properties, issues, referenced, location="metadata"):
+    if isinstance(node, list):
+        for item in node:
+            check_node(item, kinds, required, file_properties, issues, referenced, location)
+        return
+    if not isinstance(node, dict):
+        return
+    for key, values in node.items():
+        if key.startswith("@"):
+            continue
+        name = short_name(key)
+        if key.startswith(KOIO) and key not in kinds:
+            issues.append(("warning", f"{location}: '{name}' is not a KOIO property"))
+        for value in values if isinstance(values, list) else [values]:
+            if not isinstance(value, dict):
+                continue
+            is_literal = "@value" in value or "@list" in value
+            if kinds.get(key) == "node" and is_literal:
+                issues.append(("error", f"{location}: '{name}' must be an object or an @id, not a literal"))
+            elif kinds.get(key) == "literal" and not is_literal:
+                issues.append(("error", f"{location}: '{name}' must be a literal value"))
+            if key in file_properties and isinstance(value.get("@id"), str):
+                referenced.append((f"{location} > {name}", value["@id"]))
+            for properties in required.get(key, []):
+                properties = properties if isinstance(properties, tuple) else (properties,)
+                if not any(property in value for property in properties):
+                    names = " or ".join(f"'{short_name(property)}'" for property in properties)
+                    issues.append(("error", f"{location} > {name} {value.get('@id', '')}: missing {names}"))
+            if not is_literal:
+                check_node(
+                    value, kinds, required, file_properties, issues, referenced, f"{location} > {name}"
+                )
+
+
+def jsonld_error_message(error):
+    # The innermost JSON-LD error usually names the actual problem
+    while True:
+        cause = error.cause or (error.details or {}).get("cause")
+        if not isinstance(cause, jsonld.JsonLdError):
+            break
+        error = cause
+    return error.args[0] if error.args else error.type
+
+
+def validate_metadata(metadata_path, cache_dir: str = None, offline: bool = False, check_files: bool = True):
+    """
+    Validates one metadata file and returns its issues as (level, message) tuples.
+
+    The compact document is checked for the keys the SDK reads directly, then the
+    document is expanded with its (cached) contexts and checked against the KOIO
+    property rules. The @id of implementations, documentation, resources and the
+    license must exist as files or folders next to the metadata.
+    """
+    metadata_path = Path(metadata_path).resolve()
+    issues = []
+    try:
+        with open(metadata_path, "r", encoding="utf-8") as f:
+            metadata = json.load(f)
+    except (OSError, ValueError) as e:
+        return [("error", f"cannot read metadata: {e}")]
+    if not isinstance(metadata, dict):
+        return [("error", "metadata must be a JSON object")]
+    for key in REQUIRED_KEYS:
+        if key not in metadata:
+            issues.append(("error", f"missing '{key}'"))
+
+    base = metadata_path.parent.as_uri() + "/"
+    try:
+        expanded = jsonld.expand(
+            metadata, {"base": base, "documentLoader": create_document_loader(cache_dir, offline)}
+        )
+    except jsonld.JsonLdError as e:
+        issues.append(("error", f"invalid JSON-LD context: {jsonld_error_message(e)}"))
+        return issues
+    if not expanded:
+        issues.append(("error", "metadata expands to an empty document, check its context"))
+        return issues
+    if not any(t.startswith(KOIO) for t in expanded[0].get("@type", [])):
+        issues.append(("warning", "the metadata @type is not a KOIO class"))
+
+    kinds, required, file_properties = compile_schema()
+    referenced = []
+    check_node(expanded, kinds, required, file_properties, issues, referenced)
+
+    if check_files:
+        paths = {}
+        for location, iri in referenced:
+            if iri.startswith("file:"):
+                paths.setdefault(os.path.normpath(unquote(urlparse(iri).path)), location)
+        for path in find_missing_paths(paths):
+            issues.append(
+                ("error", f"{paths[path]}: {os.path.relpath(path, metadata_path.parent)} does not exist")
+            )
+    return issues